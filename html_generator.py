@@ -4,74 +4,60 @@ HTML Generator for JSON to HTML Explorer Tool
 Generates interactive HTML explorer with Windows Explorer-like interface
 """
 
+import base64
+import gzip
+import io
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
+from string import Template
+from urllib.parse import quote
 from loguru import logger
-from json_parser import prepare_tree_data, get_node_by_path, format_value_for_display
+from json_parser import prepare_tree_data, escape_html
 
-def create_interactive_html(json_data, config=None):
-    """
-    Create interactive HTML explorer for JSON data
-    
-    Args:
-        json_data (dict): Parsed JSON data from json_parser
-        config (dict, optional): Configuration options
-        
-    Returns:
-        str: Complete HTML content
-    """
-    if config is None:
-        config = {}
-    
-    # Extract data and metadata
-    data = json_data['data']
-    metadata = json_data['metadata']
-    
-    # Prepare tree data for JavaScript
-    tree_data = prepare_tree_data(data)
-    
-    # Generate HTML
-    html_content = generate_html_template(
-        tree_data=tree_data,
-        metadata=metadata,
-        config=config
-    )
-    
-    logger.info("Interactive HTML explorer generated successfully")
-    return html_content
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib serializer is used otherwise
+    orjson = None
 
-def generate_html_template(tree_data, metadata, config):
-    """
-    Generate the complete HTML template
-    
-    Args:
-        tree_data (dict): Tree structure data
-        metadata (dict): File metadata
-        config (dict): Configuration options
-        
-    Returns:
-        str: Complete HTML content
-    """
-    title = config.get('title', 'JSON Explorer')
-    
-    html = f"""<!DOCTYPE html>
+try:
+    import brotli
+except ImportError:  # Optional; precompression then only produces .gz files
+    brotli = None
+
+# File names of the shared assets written next to the HTML when not inlined
+CSS_ASSET_NAME = 'explorer.css'
+JS_ASSET_NAME = 'explorer.js'
+
+# Page shell, compiled once at import; CSS and JS are streamed between the parts
+_SHELL_HEAD = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        {generate_css()}
+    <title>$title</title>
+""")
+
+_INLINE_STYLE_OPEN = """    <style>
+        """
+
+_INLINE_STYLE_CLOSE = """
     </style>
-</head>
+"""
+
+_STYLESHEET_LINK = Template("""    <link rel="stylesheet" href="$href">
+""")
+
+_SHELL_BODY = Template("""</head>
 <body>
     <div class="container">
         <header class="header">
-            <h1>{title}</h1>
+            <h1>$title</h1>
             <div class="file-info">
-                <span class="file-name">{metadata['file_name']}</span>
-                <span class="file-size">({format_file_size(metadata['file_size'])})</span>
-                <span class="file-type">{metadata['root_type']}</span>
+                <span class="file-name">$file_name</span>
+                <span class="file-size">($file_size)</span>
+                <span class="file-type">$file_type</span>
             </div>
         </header>
         
@@ -81,9 +67,7 @@ def generate_html_template(tree_data, metadata, config):
                     <h3>Structure</h3>
                 </div>
                 <div class="tree-container">
-                    <div id="tree-view" class="tree-view">
-                        {generate_tree_html(tree_data)}
-                    </div>
+                    <div id="tree-view" class="tree-view"></div>
                 </div>
             </aside>
             
@@ -96,7 +80,7 @@ def generate_html_template(tree_data, metadata, config):
                 </div>
                 <div class="content-container">
                     <div id="content-view" class="content-view">
-                        {generate_content_html(tree_data)}
+                        <div class="placeholder">Select a node from the tree</div>
                     </div>
                 </div>
             </section>
@@ -104,13 +88,143 @@ def generate_html_template(tree_data, metadata, config):
     </div>
     
     <script>
-        {generate_javascript(tree_data)}
+        """)
+
+_SHELL_TAIL = """
     </script>
 </body>
 </html>"""
+
+_SCRIPT_LINK_TAIL = Template("""
+    </script>
+    <script src="$src"></script>
+</body>
+</html>""")
+
+def create_interactive_html(json_data, config=None):
+    """
+    Create interactive HTML explorer for JSON data
     
-    return html
+    Args:
+        json_data (dict): Parsed JSON data from json_parser
+        config (dict, optional): Configuration options
+        
+    Returns:
+        str: Complete HTML content
+    """
+    buffer = io.StringIO()
+    create_interactive_html_stream(json_data, buffer, config)
+    return buffer.getvalue()
 
+def create_interactive_html_stream(json_data, out, config=None, data_path=None):
+    """
+    Write interactive HTML explorer for JSON data to a writable sink
+    
+    Args:
+        json_data (dict): Parsed JSON data from json_parser
+        out: File-like object with a writelines() method
+        config (dict, optional): Configuration options
+        data_path (str or Path, optional): Write the tree data to this JSON
+            file and have the page fetch it instead of embedding it
+    """
+    if config is None:
+        config = {}
+    
+    # Extract data and metadata
+    data = json_data['data']
+    metadata = json_data['metadata']
+    
+    # Prepare tree data for JavaScript; the page derives node paths itself
+    tree_data = prepare_tree_data(data, with_ids=False)
+    
+    data_url = None
+    if data_path is not None:
+        write_data_file(tree_data, data_path)
+        # Relative URL of the sidecar; '#', '?' and '%' in the name must not
+        # be read as URL syntax
+        data_url = quote(Path(data_path).name)
+    
+    # Write HTML
+    write_html_template(
+        out,
+        tree_data=tree_data,
+        metadata=metadata,
+        config=config,
+        data_url=data_url
+    )
+    
+    logger.info("Interactive HTML explorer generated successfully")
+
+def generate_html_template(tree_data, metadata, config):
+    """
+    Generate the complete HTML template
+    
+    Args:
+        tree_data (dict): Tree structure data
+        metadata (dict): File metadata
+        config (dict): Configuration options
+        
+    Returns:
+        str: Complete HTML content
+    """
+    buffer = io.StringIO()
+    write_html_template(buffer, tree_data, metadata, config)
+    return buffer.getvalue()
+
+def write_html_template(out, tree_data, metadata, config, data_url=None):
+    """
+    Write the complete HTML template to a writable sink
+    
+    Args:
+        out: File-like object with a writelines() method
+        tree_data (dict): Tree structure data
+        metadata (dict): File metadata
+        config (dict): Configuration options
+        data_url (str, optional): URL the page fetches the tree data from
+    """
+    out.writelines(iter_html_template(tree_data, metadata, config, data_url))
+
+def iter_html_template(tree_data, metadata, config, data_url=None):
+    """
+    Yield the complete HTML template as a sequence of string fragments
+    
+    Fragments are produced lazily, so the shell and stylesheet can be
+    written out while the tree payload is still being serialized.
+    
+    Args:
+        tree_data (dict): Tree structure data
+        metadata (dict): File metadata
+        config (dict): Configuration options
+        data_url (str, optional): URL the page fetches the tree data from
+        
+    Yields:
+        str: Consecutive pieces of the HTML document
+    """
+    title = escape_html(config.get('title', 'JSON Explorer'))
+    
+    yield _SHELL_HEAD.substitute(title=title)
+    if config.get('inline_css', True):
+        yield _INLINE_STYLE_OPEN
+        yield generate_css()
+        yield _INLINE_STYLE_CLOSE
+    else:
+        yield _STYLESHEET_LINK.substitute(href=CSS_ASSET_NAME)
+    yield _SHELL_BODY.substitute(
+        title=title,
+        file_name=escape_html(metadata['file_name']),
+        file_size=format_file_size(metadata['file_size']),
+        file_type=escape_html(metadata['root_type'])
+    )
+    compress = config.get('compress_data', False)
+    if config.get('inline_js', True):
+        yield from iter_javascript(tree_data, compress=compress, data_url=data_url)
+        yield _SHELL_TAIL
+    else:
+        # Only the data stays inline; the explorer code is the shared script
+        yield from iter_javascript_data(tree_data, compress=compress, data_url=data_url)
+        yield _SCRIPT_LINK_TAIL.substitute(src=JS_ASSET_NAME)
+
+@lru_cache(maxsize=None)
 def generate_css():
     """Generate CSS styles for the explorer"""
     return """
@@ -196,20 +310,27 @@ def generate_css():
         }
         
         .tree-view {
-            padding: 0.5rem;
+            position: relative;
+            margin: 0.5rem;
         }
         
+        /* Rows are absolutely positioned by the virtualized tree view */
         .tree-node {
-            margin: 0.2rem 0;
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 28px;
         }
         
         .tree-node-content {
             display: flex;
             align-items: center;
-            padding: 0.3rem 0.5rem;
+            height: 100%;
+            padding: 0 0.5rem;
+            white-space: nowrap;
             border-radius: 3px;
             cursor: pointer;
-            transition: background-color 0.2s;
         }
         
         .tree-node-content:hover {
@@ -231,6 +352,8 @@ def generate_css():
         .tree-node-name {
             flex: 1;
             font-size: 0.9rem;
+            overflow: hidden;
+            text-overflow: ellipsis;
         }
         
         .tree-node-count {
@@ -239,15 +362,6 @@ def generate_css():
             margin-left: 0.5rem;
         }
         
-        .tree-children {
-            margin-left: 1.5rem;
-            display: none;
-        }
-        
-        .tree-children.expanded {
-            display: block;
-        }
-        
         .content-panel {
             flex: 1;
             display: flex;
@@ -290,6 +404,11 @@ def generate_css():
             line-height: 1.5;
         }
         
+        .placeholder {
+            color: #6c757d;
+            font-style: italic;
+        }
+        
         .json-object {
             margin: 0.5rem 0;
         }
@@ -336,8 +455,12 @@ def generate_css():
             transition: transform 0.2s;
         }
         
-        .expand-toggle.expanded {
-            transform: rotate(90deg);
+        .expand-toggle::before {
+            content: '▶';
+        }
+        
+        .tree-node.expanded .expand-toggle::before {
+            content: '▼';
         }
         
         /* Context Menu */
@@ -392,444 +515,699 @@ def generate_css():
         }
     """
 
-def generate_tree_html(node, level=0):
-    """Generate HTML for tree view"""
-    indent = "  " * level
-    
-    if node['type'] == 'truncated':
-        return f'{indent}<div class="tree-node">...</div>'
-    
-    icon_map = {
-        'object': '📁',
-        'array': '📋',
-        'primitive': '📄'
-    }
-    
-    icon = icon_map.get(node['type'], '📄')
-    expanded_class = 'expanded' if node.get('expanded', False) else ''
-    
-    # Generate count display
-    count_display = ""
-    if node['type'] == 'object' and node.get('children'):
-        count_display = f'<span class="tree-node-count">({len(node["children"])})</span>'
-    elif node['type'] == 'array' and node.get('children'):
-        count_display = f'<span class="tree-node-count">[{len(node["children"])}]</span>'
-    
-    # Generate expand toggle
-    expand_toggle = ""
-    if node.get('children'):
-        expand_toggle = f'<span class="expand-toggle {expanded_class}">▶</span>'
-    
-    html = f'{indent}<div class="tree-node" data-path="{node["id"]}">'
-    html += f'{indent}  <div class="tree-node-content" onclick="selectNode(\'{node["id"]}\')">'
-    html += f'{indent}    {expand_toggle}'
-    html += f'{indent}    <span class="tree-node-icon">{icon}</span>'
-    html += f'{indent}    <span class="tree-node-name">{node["name"]}</span>'
-    html += f'{indent}    {count_display}'
-    html += f'{indent}  </div>'
-    
-    if node.get('children'):
-        html += f'{indent}  <div class="tree-children {expanded_class}" onclick="event.stopPropagation()">'
-        for child in node['children']:
-            html += generate_tree_html(child, level + 1)
-        html += f'{indent}  </div>'
-    
-    html += f'{indent}</div>'
-    return html
-
-def generate_content_html(node):
-    """Generate initial content view"""
-    return format_json_for_display(node)
-
-def format_json_for_display(data, level=0):
-    """Format JSON data for display"""
-    indent = "  " * level
-    
-    if isinstance(data, dict):
-        html = f'{indent}<div class="json-object">'
-        for key, value in data.items():
-            html += f'{indent}  <div>'
-            html += f'{indent}    <span class="json-key">"{key}"</span>: '
-            html += f'{indent}    <span class="json-value">{format_json_for_display(value, level + 1)}</span>'
-            html += f'{indent}  </div>'
-        html += f'{indent}</div>'
-        return html
-    elif isinstance(data, list):
-        html = f'{indent}<div class="json-array">'
-        for i, item in enumerate(data):
-            html += f'{indent}  <div class="json-array-item">'
-            html += f'{indent}    <span class="json-key">[{i}]</span>: '
-            html += f'{indent}    <span class="json-value">{format_json_for_display(item, level + 1)}</span>'
-            html += f'{indent}  </div>'
-        html += f'{indent}</div>'
-        return html
-    else:
-        return format_value_for_display(data)
-
-def generate_javascript(tree_data):
-    """Generate JavaScript for interactivity"""
-    # Escape the JSON data for JavaScript
-    json_data_escaped = json.dumps(tree_data).replace('"', '\\"')
-    
-    return f"""
-        // Store the complete JSON data
-        const jsonData = JSON.parse("{json_data_escaped}");
+# Static part of the explorer script; only the data literal is spliced in per call
+_JS_TEMPLATE = """
+        // Expand the string-table payload back into plain tree nodes
+        function inflateTreeData(payload) {
+            const strings = payload.strings;
+            const inflate = (compact) => {
+                const node = {
+                    name: strings[compact.n],
+                    type: strings[compact.t],
+                    expanded: compact.e === 1,
+                    children: []
+                };
+                if ('s' in compact) {
+                    node.value = strings[compact.s];
+                } else if ('v' in compact) {
+                    node.value = compact.v;
+                }
+                return node;
+            };
+            
+            const root = inflate(payload.tree);
+            const stack = [[payload.tree, root]];
+            while (stack.length) {
+                const [compact, node] = stack.pop();
+                (compact.c || []).forEach(childCompact => {
+                    const child = inflate(childCompact);
+                    node.children.push(child);
+                    stack.push([childCompact, child]);
+                });
+            }
+            return root;
+        }
+        
+        // Tree view icons per node type
+        const NODE_ICONS = {
+            object: '📁',
+            array: '📋',
+            primitive: '📄'
+        };
+        
+        // Fixed row geometry for the virtualized tree (must match the CSS)
+        const TREE_ROW_HEIGHT = 28;
+        const TREE_ROW_BUFFER = 10;
+        const TREE_INDENT_REM = 1.5;
+        
+        // Row skeleton cloned for every rendered tree node
+        const TREE_ROW_TEMPLATE = (() => {
+            const row = document.createElement('div');
+            row.className = 'tree-node';
+            const content = document.createElement('div');
+            content.className = 'tree-node-content';
+            ['expand-toggle', 'tree-node-icon', 'tree-node-name', 'tree-node-count'].forEach(className => {
+                const span = document.createElement('span');
+                span.className = className;
+                content.appendChild(span);
+            });
+            row.appendChild(content);
+            return row;
+        })();
         
         // TreeNode class for managing individual tree nodes
-        class TreeNode {{
-            constructor(data, path, type, parent = null) {{
+        class TreeNode {
+            constructor(data, type, parent = null) {
                 this.data = data;
-                this.path = path;
+                this._path = null;
                 this.type = type;
                 this.parent = parent;
                 this.children = [];
-                this.expanded = false;
+                this.name = data.name;
                 this.selected = false;
-                this.element = null;
+                this.layout = null;
+                this.index = -1;
+                this._pathIndex = null;
+                this._value = undefined;
+                this._json = null;
                 this.depth = parent ? parent.depth + 1 : 0;
-            }}
+            }
+            
+            get path() {
+                // Paths are not shipped in the payload; derive and cache on demand
+                if (this._path === null) {
+                    if (!this.parent) {
+                        this._path = 'root';
+                    } else if (!this.parent.parent) {
+                        this._path = this.name;
+                    } else if (this.parent.type === 'array') {
+                        this._path = this.parent.path + this.name;
+                    } else {
+                        this._path = `${this.parent.path}.${this.name}`;
+                    }
+                }
+                return this._path;
+            }
             
-            addChild(child) {{
+            addChild(child) {
                 child.parent = this;
                 child.depth = this.depth + 1;
+                child._path = null;
                 this.children.push(child);
                 return child;
-            }}
+            }
             
-            removeChild(child) {{
+            removeChild(child) {
                 const index = this.children.indexOf(child);
-                if (index > -1) {{
+                if (index > -1) {
                     this.children.splice(index, 1);
                     child.parent = null;
-                }}
+                    child._path = null;
+                }
                 return child;
-            }}
-            
-            toggleExpanded() {{
-                this.expanded = !this.expanded;
-                if (this.element) {{
-                    const children = this.element.querySelector('.tree-children');
-                    const toggle = this.element.querySelector('.expand-toggle');
-                    if (children && toggle) {{
-                        if (this.expanded) {{
-                            children.classList.add('expanded');
-                            toggle.textContent = '▼';
-                        }} else {{
-                            children.classList.remove('expanded');
-                            toggle.textContent = '▶';
-                        }}
-                    }}
-                }}
+            }
+            
+            get expanded() {
+                return this.layout.expanded[this.index] === 1;
+            }
+            
+            set expanded(expanded) {
+                this.layout.setExpanded(this.index, expanded);
+            }
+            
+            toggleExpanded() {
+                return this.setExpanded(!this.expanded);
+            }
+            
+            setExpanded(expanded) {
+                // Only the model changes here; the tree view redraws its window
+                this.expanded = expanded;
                 return this.expanded;
-            }}
-            
-            select() {{
-                // Deselect all other nodes
-                TreeNode.deselectAll();
-                this.selected = true;
-                if (this.element) {{
-                    this.element.classList.add('selected');
-                }}
-                return this;
-            }}
+            }
             
-            deselect() {{
-                this.selected = false;
-                if (this.element) {{
-                    this.element.classList.remove('selected');
-                }}
-                return this;
-            }}
-            
-            static deselectAll() {{
-                document.querySelectorAll('.tree-node').forEach(node => {{
-                    node.classList.remove('selected');
-                }});
-                TreeNode.selectedNodes.forEach(node => {{
-                    node.selected = false;
-                }});
-                TreeNode.selectedNodes = [];
-            }}
-            
-            static selectedNodes = [];
-            
-            static createFromData(data, path = '', parent = null) {{
-                let type = 'primitive';
-                if (Array.isArray(data)) {{
-                    type = 'array';
-                }} else if (data !== null && typeof data === 'object') {{
-                    type = 'object';
-                }}
+            render() {
+                // One deep clone per row instead of a createElement per span
+                return this.renderInto(TREE_ROW_TEMPLATE.cloneNode(true));
+            }
+            
+            renderInto(element) {
+                // Fill a row cloned from TREE_ROW_TEMPLATE, which may be recycled from another node,
+                // so every field is assigned and no span is ever removed
+                element.setAttribute('data-path', this.path);
                 
-                const node = new TreeNode(data, path, type, parent);
+                const content = element.firstChild;
+                content.classList.toggle('selected', this.selected);
+                content.style.paddingLeft = `${0.5 + this.depth * TREE_INDENT_REM}rem`;
                 
-                if (type === 'object') {{
-                    Object.keys(data).forEach(key => {{
-                        const childPath = path ? `${{path}}.${{key}}` : key;
-                        const childNode = TreeNode.createFromData(data[key], childPath, node);
-                        node.addChild(childNode);
-                    }});
-                }} else if (type === 'array') {{
-                    data.forEach((item, index) => {{
-                        const childPath = `${{path}}[${{index}}]`;
-                        const childNode = TreeNode.createFromData(item, childPath, node);
-                        node.addChild(childNode);
-                    }});
-                }}
+                // The toggle glyph comes from CSS keyed on the row's expanded class
+                element.classList.toggle('expanded', this.expanded && this.hasChildren());
                 
-                return node;
-            }}
-            
-            findNodeByPath(targetPath) {{
-                if (this.path === targetPath) {{
-                    return this;
-                }}
+                const [toggle, icon, name, count] = content.children;
+                if (this.type === 'truncated') {
+                    icon.textContent = '';
+                    name.textContent = '...';
+                    count.textContent = '';
+                    toggle.style.visibility = 'hidden';
+                    return element;
+                }
+                
+                icon.textContent = NODE_ICONS[this.type] || NODE_ICONS.primitive;
+                name.textContent = this.getDisplayName();
                 
-                for (const child of this.children) {{
-                    const found = child.findNodeByPath(targetPath);
-                    if (found) return found;
-                }}
+                if (this.hasChildren()) {
+                    toggle.style.visibility = '';
+                    const size = this.getChildCount();
+                    count.textContent = this.type === 'array' ? `[${size}]` : `(${size})`;
+                } else {
+                    toggle.style.visibility = 'hidden';
+                    count.textContent = '';
+                }
                 
-                return null;
-            }}
+                return element;
+            }
             
-            expandToPath(targetPath) {{
-                if (this.path === targetPath) {{
+            static createFromData(data) {
+                return new TreeLayout(data).root;
+            }
+            
+            findNodeByPath(targetPath) {
+                // Index the subtree by path once, on the first lookup
+                if (!this._pathIndex) {
+                    this._pathIndex = new Map();
+                    const stack = [this];
+                    while (stack.length) {
+                        const node = stack.pop();
+                        this._pathIndex.set(node.path, node);
+                        for (const child of node.children) {
+                            stack.push(child);
+                        }
+                    }
+                }
+                
+                return this._pathIndex.get(targetPath) || null;
+            }
+            
+            expandToPath(targetPath) {
+                if (this.path === targetPath) {
                     return true;
-                }}
+                }
                 
-                for (const child of this.children) {{
-                    if (child.path === targetPath || targetPath.startsWith(child.path + '.')) {{
-                        this.expanded = true;
-                        if (this.element) {{
-                            const children = this.element.querySelector('.tree-children');
-                            const toggle = this.element.querySelector('.expand-toggle');
-                            if (children && toggle) {{
-                                children.classList.add('expanded');
-                                toggle.textContent = '▼';
-                            }}
-                        }}
+                for (const child of this.children) {
+                    if (child.path === targetPath || targetPath.startsWith(child.path + '.')) {
+                        this.setExpanded(true);
                         return child.expandToPath(targetPath);
-                    }}
-                }}
+                    }
+                }
                 
                 return false;
-            }}
-            
-            getValue() {{
-                return this.data;
-            }}
-            
-            getDisplayName() {{
-                if (this.parent) {{
-                    if (this.parent.type === 'array') {{
-                        const index = this.parent.children.indexOf(this);
-                        return `[${{index}}]`;
-                    }} else {{
-                        const parentPath = this.parent.path;
-                        const fullPath = this.path;
-                        return fullPath.substring(parentPath.length + 1);
-                    }}
-                }}
-                return this.path || 'root';
-            }}
-            
-            getType() {{
+            }
+            
+            getValue() {
+                // The data never changes after load, so memoize on the node
+                if (this._value === undefined) {
+                    this._value = this.buildValue();
+                }
+                return this._value;
+            }
+            
+            getJson() {
+                // Pretty-printed value for copying; serialized once per node
+                if (this._json === null) {
+                    this._json = JSON.stringify(this.getValue(), null, 2);
+                }
+                return this._json;
+            }
+            
+            buildValue() {
+                switch (this.type) {
+                    case 'object': {
+                        const value = {};
+                        this.children.forEach(child => {
+                            value[child.name] = child.getValue();
+                        });
+                        return value;
+                    }
+                    case 'array':
+                        return this.children.map(child => child.getValue());
+                    case 'truncated':
+                        return '...';
+                    default:
+                        return this.data.value;
+                }
+            }
+            
+            getDisplayName() {
+                return this.name;
+            }
+            
+            getType() {
                 return this.type;
-            }}
+            }
             
-            hasChildren() {{
+            hasChildren() {
                 return this.children.length > 0;
-            }}
+            }
             
-            getChildCount() {{
+            getChildCount() {
                 return this.children.length;
-            }}
-        }}
+            }
+        }
+        
+        // Preorder structure-of-arrays view of the tree for the hot iteration paths.
+        // A node's subtree occupies the contiguous index range [index, subtreeEnd[index]),
+        // so its first child is index + 1 and its next sibling is subtreeEnd[index].
+        class TreeLayout {
+            constructor(data) {
+                const nodes = [];
+                const stack = [[data, null]];
+                while (stack.length) {
+                    const [nodeData, parent] = stack.pop();
+                    const node = new TreeNode(nodeData, nodeData.type);
+                    node.layout = this;
+                    node.index = nodes.length;
+                    nodes.push(node);
+                    if (parent) {
+                        parent.addChild(node);
+                    }
+                    const children = nodeData.children || [];
+                    for (let i = children.length - 1; i >= 0; i--) {
+                        stack.push([children[i], node]);
+                    }
+                }
+                
+                const count = nodes.length;
+                this.nodes = nodes;
+                this.parent = new Int32Array(count);
+                this.subtreeEnd = new Int32Array(count);
+                this.expanded = new Uint8Array(count);
+                // Rows the descendants of a node occupy when it is expanded
+                this.descendantRows = new Int32Array(count);
+                
+                // Walk backwards so every child's range is known before its parent's
+                for (let i = count - 1; i >= 0; i--) {
+                    const node = nodes[i];
+                    const lastChild = node.children[node.children.length - 1];
+                    this.parent[i] = node.parent ? node.parent.index : -1;
+                    this.subtreeEnd[i] = lastChild ? this.subtreeEnd[lastChild.index] : i + 1;
+                    this.expanded[i] = node.data.expanded ? 1 : 0;
+                }
+                this.countRange(0, count);
+            }
+            
+            get root() {
+                return this.nodes[0];
+            }
+            
+            visibleCount(index) {
+                // Rows the node occupies in the flattened view: itself plus any shown descendants
+                return 1 + (this.expanded[index] ? this.descendantRows[index] : 0);
+            }
+            
+            countRange(start, end) {
+                // Backwards, so each child's count is final before its parent sums it
+                for (let i = end - 1; i >= start; i--) {
+                    let rows = 0;
+                    for (let child = i + 1; child < this.subtreeEnd[i]; child = this.subtreeEnd[child]) {
+                        rows += this.visibleCount(child);
+                    }
+                    this.descendantRows[i] = rows;
+                }
+            }
+            
+            propagate(index, delta) {
+                // Only ancestors up to the first collapsed one see the change
+                for (let p = this.parent[index]; p >= 0 && delta !== 0; p = this.parent[p]) {
+                    this.descendantRows[p] += delta;
+                    if (!this.expanded[p]) break;
+                }
+            }
+            
+            setExpanded(index, expanded) {
+                const flag = expanded ? 1 : 0;
+                if (this.expanded[index] === flag) return;
+                this.expanded[index] = flag;
+                this.propagate(index, expanded ? this.descendantRows[index] : -this.descendantRows[index]);
+            }
+            
+            setSubtreeExpanded(index, expanded) {
+                const before = this.visibleCount(index);
+                this.expanded.fill(expanded ? 1 : 0, index, this.subtreeEnd[index]);
+                this.countRange(index, this.subtreeEnd[index]);
+                this.propagate(index, this.visibleCount(index) - before);
+            }
+        }
+        
+        // FlatTreeView renders only the rows inside the scroll viewport
+        class FlatTreeView {
+            constructor(container, listElement, rootNode) {
+                this.container = container;
+                this.listElement = listElement;
+                this.layout = rootNode.layout;
+                const count = this.layout.nodes.length;
+                // rows[r] is the layout index shown at row r; rowOf[i] is the reverse (-1 if hidden)
+                this.rows = new Int32Array(count);
+                this.rowOf = new Int32Array(count);
+                this.rowCount = 0;
+                this.rowPool = [];
+                this.renderPending = false;
+                this.refreshPending = false;
+                
+                this.container.addEventListener('scroll', () => this.scheduleRender());
+                window.addEventListener('resize', () => this.scheduleRender());
+                this.refresh();
+            }
+            
+            refresh() {
+                // Flatten the expanded part of the tree in display order: a
+                // sequential scan that jumps over the range of collapsed subtrees
+                const { expanded, subtreeEnd } = this.layout;
+                const count = expanded.length;
+                const rows = this.rows;
+                const rowOf = this.rowOf;
+                let rowCount = 0;
+                rowOf.fill(-1);
+                for (let i = 0; i < count; i = expanded[i] ? i + 1 : subtreeEnd[i]) {
+                    rowOf[i] = rowCount;
+                    rows[rowCount++] = i;
+                }
+                this.rowCount = rowCount;
+                
+                // A spacer-sized list keeps the scrollbar proportional to all rows
+                this.listElement.style.height = `${rowCount * TREE_ROW_HEIGHT}px`;
+                this.render();
+            }
+            
+            scheduleRender() {
+                if (this.renderPending) return;
+                this.renderPending = true;
+                requestAnimationFrame(() => {
+                    this.renderPending = false;
+                    if (this.refreshPending) {
+                        this.refreshPending = false;
+                        this.refresh();
+                    } else {
+                        this.render();
+                    }
+                });
+            }
+            
+            scheduleRefresh() {
+                // Coalesce bulk model changes into one flatten + redraw per frame
+                this.refreshPending = true;
+                this.scheduleRender();
+            }
+            
+            render() {
+                const viewportRows = Math.ceil(this.container.clientHeight / TREE_ROW_HEIGHT);
+                const first = Math.max(0, Math.floor(this.container.scrollTop / TREE_ROW_HEIGHT) - TREE_ROW_BUFFER);
+                const last = Math.min(this.rowCount, first + viewportRows + 2 * TREE_ROW_BUFFER);
+                
+                // Rows are recycled: the pool only grows to the largest window seen,
+                // and scrolling just reassigns text and position on existing elements
+                const needed = Math.max(0, last - first);
+                if (this.rowPool.length < needed) {
+                    const fragment = document.createDocumentFragment();
+                    while (this.rowPool.length < needed) {
+                        const row = TREE_ROW_TEMPLATE.cloneNode(true);
+                        this.rowPool.push(row);
+                        fragment.appendChild(row);
+                    }
+                    this.listElement.appendChild(fragment);
+                }
+                
+                for (let i = 0; i < this.rowPool.length; i++) {
+                    const row = this.rowPool[i];
+                    if (i >= needed) {
+                        row.style.display = 'none';
+                        row.removeAttribute('data-index');
+                        continue;
+                    }
+                    const rowIndex = first + i;
+                    this.nodeAtRow(rowIndex).renderInto(row);
+                    row.setAttribute('data-index', rowIndex);
+                    row.style.display = '';
+                    // Transforms move rows on the compositor without relayout
+                    row.style.transform = `translateY(${rowIndex * TREE_ROW_HEIGHT}px)`;
+                }
+            }
+            
+            applyToggle(node) {
+                // Splice just the toggled subtree's rows in or out instead of re-flattening
+                const row = this.rowOf[node.index];
+                if (row < 0) return;
+                
+                const { expanded, subtreeEnd } = this.layout;
+                const rows = this.rows;
+                const rowOf = this.rowOf;
+                const count = this.layout.descendantRows[node.index];
+                if (count === 0) {
+                    this.render();
+                    return;
+                }
+                
+                if (expanded[node.index]) {
+                    rows.copyWithin(row + 1 + count, row + 1, this.rowCount);
+                    let r = row + 1;
+                    for (let i = node.index + 1; i < subtreeEnd[node.index]; i = expanded[i] ? i + 1 : subtreeEnd[i]) {
+                        rows[r++] = i;
+                    }
+                    this.rowCount += count;
+                } else {
+                    for (let r = row + 1; r <= row + count; r++) {
+                        rowOf[rows[r]] = -1;
+                    }
+                    rows.copyWithin(row + 1, row + 1 + count, this.rowCount);
+                    this.rowCount -= count;
+                }
+                for (let r = row + 1; r < this.rowCount; r++) {
+                    rowOf[rows[r]] = r;
+                }
+                
+                this.listElement.style.height = `${this.rowCount * TREE_ROW_HEIGHT}px`;
+                this.render();
+            }
+            
+            nodeAtRow(row) {
+                return row >= 0 && row < this.rowCount ? this.layout.nodes[this.rows[row]] : null;
+            }
+            
+            rowIndexOf(node) {
+                return this.rowOf[node.index];
+            }
+            
+            scrollToNode(node) {
+                const rowIndex = this.rowIndexOf(node);
+                if (rowIndex < 0) return;
+                const top = rowIndex * TREE_ROW_HEIGHT;
+                if (top < this.container.scrollTop) {
+                    this.container.scrollTop = top;
+                } else if (top + TREE_ROW_HEIGHT > this.container.scrollTop + this.container.clientHeight) {
+                    this.container.scrollTop = top + TREE_ROW_HEIGHT - this.container.clientHeight;
+                }
+                this.scheduleRender();
+            }
+        }
         
         // ContentRenderer class for displaying JSON content
-        class ContentRenderer {{
-            constructor() {{
+        class ContentRenderer {
+            constructor() {
                 this.contentView = null;
                 this.currentNode = null;
-                this.config = {{
+                this.contentCache = new WeakMap();
+                this.config = {
                     showLineNumbers: true,
                     enableSyntaxHighlighting: true,
                     maxDisplayLength: 1000,
                     expandLevels: 2
-                }};
-            }}
+                };
+            }
             
-            initialize(contentViewElement) {{
+            initialize(contentViewElement) {
                 this.contentView = contentViewElement;
                 return this;
-            }}
+            }
             
-            render(node) {{
-                if (!this.contentView) {{
+            render(node) {
+                if (!this.contentView) {
                     console.error('ContentRenderer not initialized');
                     return;
-                }}
+                }
                 
                 this.currentNode = node;
-                const html = this.generateHTML(node);
-                this.contentView.innerHTML = html;
+                // Build off-document once per node and re-insert on later visits
+                let content = this.contentCache.get(node);
+                if (!content) {
+                    content = this.buildContent(node);
+                    this.contentCache.set(node, content);
+                }
+                this.contentView.replaceChildren(content);
                 
                 // Update path display
                 this.updatePathDisplay(node.path);
                 
                 return this;
-            }}
+            }
+            
+            createElement(tag, className, text) {
+                const element = document.createElement(tag);
+                if (className) {
+                    element.className = className;
+                }
+                if (text !== undefined) {
+                    element.textContent = text;
+                }
+                return element;
+            }
             
-            generateHTML(node) {{
-                if (!node) {{
-                    return '<div class="error">No node selected</div>';
-                }}
+            buildContent(node) {
+                if (!node) {
+                    return this.createElement('div', 'error', 'No node selected');
+                }
                 
                 const data = node.getValue();
                 const type = node.getType();
                 
-                switch (type) {{
+                switch (type) {
                     case 'object':
                         return this.renderObject(data, node);
                     case 'array':
                         return this.renderArray(data, node);
                     case 'primitive':
+                    case 'truncated':
                         return this.renderPrimitive(data);
                     default:
-                        return '<div class="error">Unknown data type</div>';
-                }}
-            }}
-            
-            renderObject(obj, node) {{
-                if (!obj || typeof obj !== 'object') {{
-                    return '<div class="json-object">{{}}</div>';
-                }}
+                        return this.createElement('div', 'error', 'Unknown data type');
+                }
+            }
+            
+            renderObject(obj, node) {
+                if (!obj || typeof obj !== 'object') {
+                    return this.createElement('div', 'json-object', '{}');
+                }
                 
                 const keys = Object.keys(obj);
-                if (keys.length === 0) {{
-                    return '<div class="json-object">{{}}</div>';
-                }}
+                if (keys.length === 0) {
+                    return this.createElement('div', 'json-object', '{}');
+                }
                 
-                let html = '<div class="json-object">';
-                html += '<div class="json-object-header">Object with ' + keys.length + ' properties</div>';
+                const container = this.createElement('div', 'json-object');
+                const fragment = document.createDocumentFragment();
+                fragment.appendChild(this.createElement('div', 'json-object-header', `Object with ${keys.length} properties`));
                 
-                keys.forEach(key => {{
+                keys.forEach(key => {
                     const value = obj[key];
                     const valueType = this.getTypeName(value);
-                    const displayValue = this.formatValue(value, 0);
                     
-                    html += `<div class="json-property">`;
-                    html += `<span class="json-key">"${{key}}"</span>: `;
-                    html += `<span class="json-value ${{valueType}}-value">${{displayValue}}</span>`;
-                    html += `</div>`;
-                }});
-                
-                html += '</div>';
-                return html;
-            }}
-            
-            renderArray(arr, node) {{
-                if (!Array.isArray(arr)) {{
-                    return '<div class="json-array">[]</div>';
-                }}
+                    const row = this.createElement('div', 'json-property');
+                    const valueElement = this.createElement('span', `json-value ${valueType}-value`);
+                    valueElement.appendChild(this.formatValue(value, 0));
+                    row.append(this.createElement('span', 'json-key', `"${key}"`), ': ', valueElement);
+                    fragment.appendChild(row);
+                });
                 
-                if (arr.length === 0) {{
-                    return '<div class="json-array">[]</div>';
-                }}
+                container.appendChild(fragment);
+                return container;
+            }
+            
+            renderArray(arr, node) {
+                if (!Array.isArray(arr) || arr.length === 0) {
+                    return this.createElement('div', 'json-array', '[]');
+                }
                 
-                let html = '<div class="json-array">';
-                html += '<div class="json-array-header">Array with ' + arr.length + ' items</div>';
+                const container = this.createElement('div', 'json-array');
+                const fragment = document.createDocumentFragment();
+                fragment.appendChild(this.createElement('div', 'json-array-header', `Array with ${arr.length} items`));
                 
-                arr.forEach((item, index) => {{
+                arr.forEach((item, index) => {
                     const valueType = this.getTypeName(item);
-                    const displayValue = this.formatValue(item, 0);
                     
-                    html += `<div class="json-array-item">`;
-                    html += `<span class="json-index">[${{index}}]</span>: `;
-                    html += `<span class="json-value ${{valueType}}-value">${{displayValue}}</span>`;
-                    html += `</div>`;
-                }});
+                    const row = this.createElement('div', 'json-array-item');
+                    const valueElement = this.createElement('span', `json-value ${valueType}-value`);
+                    valueElement.appendChild(this.formatValue(item, 0));
+                    row.append(this.createElement('span', 'json-index', `[${index}]`), ': ', valueElement);
+                    fragment.appendChild(row);
+                });
                 
-                html += '</div>';
-                return html;
-            }}
+                container.appendChild(fragment);
+                return container;
+            }
             
-            renderPrimitive(value) {{
+            renderPrimitive(value) {
                 const type = this.getTypeName(value);
-                const displayValue = this.formatValue(value, 0);
                 
-                return `<div class="json-primitive">
-                    <span class="json-value ${{type}}-value">${{displayValue}}</span>
-                    <div class="json-type-info">Type: ${{type}}</div>
-                </div>`;
-            }}
-            
-            formatValue(value, level = 0) {{
-                if (level > this.config.expandLevels) {{
-                    return this.getTypeName(value) + '...';
-                }}
+                const container = this.createElement('div', 'json-primitive');
+                const valueElement = this.createElement('span', `json-value ${type}-value`);
+                valueElement.appendChild(this.formatValue(value, 0));
+                container.append(valueElement, this.createElement('div', 'json-type-info', `Type: ${type}`));
+                return container;
+            }
+            
+            formatValue(value, level = 0) {
+                if (level > this.config.expandLevels) {
+                    return document.createTextNode(this.getTypeName(value) + '...');
+                }
                 
-                if (value === null) {{
-                    return '<span class="json-null">null</span>';
-                }}
+                if (value === null) {
+                    return this.createElement('span', 'json-null', 'null');
+                }
                 
-                if (typeof value === 'boolean') {{
-                    return `<span class="json-boolean">${{value}}</span>`;
-                }}
+                if (typeof value === 'boolean') {
+                    return this.createElement('span', 'json-boolean', String(value));
+                }
                 
-                if (typeof value === 'number') {{
-                    return `<span class="json-number">${{value}}</span>`;
-                }}
+                if (typeof value === 'number') {
+                    return this.createElement('span', 'json-number', String(value));
+                }
                 
-                if (typeof value === 'string') {{
+                if (typeof value === 'string') {
                     const truncated = value.length > this.config.maxDisplayLength 
                         ? value.substring(0, this.config.maxDisplayLength) + '...'
                         : value;
-                    return `<span class="json-string">"${{truncated}}"</span>`;
-                }}
+                    return this.createElement('span', 'json-string', `"${truncated}"`);
+                }
                 
-                if (Array.isArray(value)) {{
-                    if (level >= this.config.expandLevels) {{
-                        return `<span class="json-array">[Array with ${{value.length}} items]</span>`;
-                    }}
+                if (Array.isArray(value)) {
+                    if (level >= this.config.expandLevels) {
+                        return this.createElement('span', 'json-array', `[Array with ${value.length} items]`);
+                    }
                     
-                    let html = '<span class="json-array">[';
+                    const span = this.createElement('span', 'json-array', '[');
                     const items = value.slice(0, 5); // Show first 5 items
-                    items.forEach((item, index) => {{
-                        if (index > 0) html += ', ';
-                        html += this.formatValue(item, level + 1);
-                    }});
-                    if (value.length > 5) {{
-                        html += `, ... (+${{value.length - 5}} more)`;
-                    }}
-                    html += ']</span>';
-                    return html;
-                }}
+                    items.forEach((item, index) => {
+                        if (index > 0) span.append(', ');
+                        span.appendChild(this.formatValue(item, level + 1));
+                    });
+                    if (value.length > 5) {
+                        span.append(`, ... (+${value.length - 5} more)`);
+                    }
+                    span.append(']');
+                    return span;
+                }
                 
-                if (typeof value === 'object') {{
-                    if (level >= this.config.expandLevels) {{
-                        const keys = Object.keys(value);
-                        return `<span class="json-object">{{Object with ${{keys.length}} properties}}</span>`;
-                    }}
+                if (typeof value === 'object') {
+                    const allKeys = Object.keys(value);
+                    if (level >= this.config.expandLevels) {
+                        return this.createElement('span', 'json-object', `{Object with ${allKeys.length} properties}`);
+                    }
                     
-                    let html = '<span class="json-object">{{';
-                    const keys = Object.keys(value).slice(0, 3); // Show first 3 properties
-                    keys.forEach((key, index) => {{
-                        if (index > 0) html += ', ';
-                        html += `"${{key}}": ${{this.formatValue(value[key], level + 1)}}`;
-                    }});
-                    if (Object.keys(value).length > 3) {{
-                        html += `, ... (+${{Object.keys(value).length - 3}} more)`;
-                    }}
-                    html += '}}</span>';
-                    return html;
-                }}
+                    const span = this.createElement('span', 'json-object', '{');
+                    const keys = allKeys.slice(0, 3); // Show first 3 properties
+                    keys.forEach((key, index) => {
+                        if (index > 0) span.append(', ');
+                        span.append(`"${key}": `);
+                        span.appendChild(this.formatValue(value[key], level + 1));
+                    });
+                    if (allKeys.length > 3) {
+                        span.append(`, ... (+${allKeys.length - 3} more)`);
+                    }
+                    span.append('}');
+                    return span;
+                }
                 
-                return `<span class="json-unknown">${{value}}</span>`;
-            }}
+                return this.createElement('span', 'json-unknown', String(value));
+            }
             
-            getTypeName(value) {{
+            getTypeName(value) {
                 if (value === null) return 'null';
                 if (typeof value === 'boolean') return 'boolean';
                 if (typeof value === 'number') return 'number';
@@ -837,57 +1215,66 @@ def generate_javascript(tree_data):
                 if (Array.isArray(value)) return 'array';
                 if (typeof value === 'object') return 'object';
                 return 'unknown';
-            }}
+            }
             
-            updatePathDisplay(path) {{
+            updatePathDisplay(path) {
                 const pathElement = document.getElementById('current-path');
-                if (pathElement) {{
+                if (pathElement) {
                     pathElement.textContent = path || 'root';
-                }}
-            }}
+                }
+            }
             
-            setConfig(newConfig) {{
-                this.config = {{...this.config, ...newConfig}};
+            setConfig(newConfig) {
+                this.config = {...this.config, ...newConfig};
+                // Cached views were built with the old settings
+                this.contentCache = new WeakMap();
                 return this;
-            }}
+            }
             
-            getConfig() {{
-                return {{...this.config}};
-            }}
+            getConfig() {
+                return {...this.config};
+            }
             
-            clear() {{
-                if (this.contentView) {{
-                    this.contentView.innerHTML = '';
-                }}
+            clear() {
+                if (this.contentView) {
+                    this.contentView.replaceChildren();
+                }
                 this.currentNode = null;
                 return this;
-            }}
-        }}
+            }
+        }
         
         // Event Handling System
-        class EventHandler {{
-            constructor() {{
+        class EventHandler {
+            constructor() {
                 this.rootNode = null;
                 this.contentRenderer = null;
+                this.treeView = null;
                 this.selectedNode = null;
                 this.contextMenu = null;
+                this.contextTarget = null;
+                this.copyTextArea = null;
+                this._pendingSelect = null;
+                this._rafId = 0;
                 this.isInitialized = false;
-            }}
+            }
             
-            initialize(rootNode, contentRenderer) {{
+            initialize(rootNode, contentRenderer, treeView) {
                 this.rootNode = rootNode;
                 this.contentRenderer = contentRenderer;
+                this.treeView = treeView;
                 this.setupEventListeners();
                 this.createContextMenu();
                 this.isInitialized = true;
                 return this;
-            }}
+            }
             
-            setupEventListeners() {{
-                // Tree node click events
-                document.addEventListener('click', (e) => this.handleNodeClick(e));
-                document.addEventListener('dblclick', (e) => this.handleNodeDoubleClick(e));
-                document.addEventListener('contextmenu', (e) => this.handleContextMenu(e));
+            setupEventListeners() {
+                // One delegated listener per event type on the tree list; rows never get their own
+                const treeList = this.treeView.listElement;
+                treeList.addEventListener('click', (e) => this.handleNodeClick(e));
+                treeList.addEventListener('dblclick', (e) => this.handleNodeDoubleClick(e));
+                treeList.addEventListener('contextmenu', (e) => this.handleContextMenu(e));
                 
                 // Keyboard events
                 document.addEventListener('keydown', (e) => this.handleKeyboard(e));
@@ -897,43 +1284,50 @@ def generate_javascript(tree_data):
                 
                 // Expand/collapse all buttons
                 this.setupToolbarEvents();
-            }}
+            }
             
-            handleNodeClick(e) {{
-                const treeNode = e.target.closest('.tree-node');
+            getTreeNode(e) {
+                // Rows carry their position in the flattened list, so no lookup is needed
+                const row = e.target.closest('.tree-node[data-index]');
+                return row ? this.treeView.nodeAtRow(Number(row.getAttribute('data-index'))) : null;
+            }
+            
+            handleNodeClick(e) {
+                const treeNode = this.getTreeNode(e);
                 if (!treeNode) return;
                 
-                const expandToggle = e.target.closest('.expand-toggle');
-                if (expandToggle) {{
+                // Leaves keep a hidden toggle so recycled rows share one shape; it is not a control
+                const expandToggle = treeNode.hasChildren() && e.target.closest('.expand-toggle');
+                if (expandToggle) {
                     this.toggleNodeExpansion(treeNode);
                     return;
-                }}
+                }
                 
                 this.selectNode(treeNode);
-            }}
+            }
             
-            handleNodeDoubleClick(e) {{
-                const treeNode = e.target.closest('.tree-node');
+            handleNodeDoubleClick(e) {
+                const treeNode = this.getTreeNode(e);
                 if (!treeNode) return;
                 
                 const expandToggle = e.target.closest('.expand-toggle');
                 if (expandToggle) return; // Don't double-expand toggle buttons
                 
                 this.toggleNodeExpansion(treeNode);
-            }}
+            }
             
-            handleContextMenu(e) {{
-                const treeNode = e.target.closest('.tree-node');
+            handleContextMenu(e) {
+                const treeNode = this.getTreeNode(e);
                 if (!treeNode) return;
                 
                 e.preventDefault();
                 this.showContextMenu(e, treeNode);
-            }}
+            }
             
-            handleKeyboard(e) {{
+            handleKeyboard(e) {
                 if (!this.selectedNode) return;
                 
-                switch (e.key) {{
+                switch (e.key) {
                     case 'ArrowUp':
                         e.preventDefault();
                         this.selectPreviousNode();
@@ -958,94 +1352,99 @@ def generate_javascript(tree_data):
                     case 'Escape':
                         this.closeContextMenu();
                         break;
-                }}
-            }}
-            
-            selectNode(treeNode) {{
-                // Remove previous selection
-                if (this.selectedNode) {{
-                    this.selectedNode.classList.remove('selected');
-                }}
-                
-                // Add selection to current node
-                treeNode.classList.add('selected');
-                this.selectedNode = treeNode;
+                }
+            }
+            
+            setSelection(node) {
+                // Move the selection flag; the row class follows on redraw
+                if (this.selectedNode) {
+                    this.selectedNode.selected = false;
+                }
+                node.selected = true;
+                this.selectedNode = node;
+            }
+            
+            selectNode(node) {
+                this.setSelection(node);
+                this.treeView.render();
                 
                 // Update content
-                const nodePath = treeNode.getAttribute('data-path');
-                const node = this.rootNode.findNodeByPath(nodePath);
-                if (node && this.contentRenderer) {{
+                if (this.contentRenderer) {
                     this.contentRenderer.render(node);
-                }}
-            }}
+                }
+            }
             
-            toggleNodeExpansion(treeNode) {{
-                const nodePath = treeNode.getAttribute('data-path');
-                const node = this.rootNode.findNodeByPath(nodePath);
-                
-                if (node) {{
-                    node.toggleExpanded();
-                }}
-            }}
+            queueSelectNode(node) {
+                // Key repeat can outpace rendering, so the selection moves now
+                // but only the latest one per frame is drawn
+                this.setSelection(node);
+                this._pendingSelect = node;
+                if (!this._rafId) {
+                    this._rafId = requestAnimationFrame(() => {
+                        this._rafId = 0;
+                        const pending = this._pendingSelect;
+                        this._pendingSelect = null;
+                        if (pending) {
+                            this.selectNode(pending);
+                        }
+                    });
+                }
+            }
+            
+            toggleNodeExpansion(node) {
+                node.toggleExpanded();
+                this.treeView.applyToggle(node);
+            }
             
-            selectPreviousNode() {{
+            selectPreviousNode() {
                 if (!this.selectedNode) return;
                 
-                const prevNode = this.selectedNode.previousElementSibling;
-                if (prevNode && prevNode.classList.contains('tree-node')) {{
-                    this.selectNode(prevNode);
+                const index = this.treeView.rowIndexOf(this.selectedNode);
+                if (index > 0) {
+                    const prevNode = this.treeView.nodeAtRow(index - 1);
+                    this.queueSelectNode(prevNode);
                     this.scrollToNode(prevNode);
-                }}
-            }}
+                }
+            }
             
-            selectNextNode() {{
+            selectNextNode() {
                 if (!this.selectedNode) return;
                 
-                const nextNode = this.selectedNode.nextElementSibling;
-                if (nextNode && nextNode.classList.contains('tree-node')) {{
-                    this.selectNode(nextNode);
+                const index = this.treeView.rowIndexOf(this.selectedNode);
+                if (index >= 0 && index < this.treeView.rowCount - 1) {
+                    const nextNode = this.treeView.nodeAtRow(index + 1);
+                    this.queueSelectNode(nextNode);
                     this.scrollToNode(nextNode);
-                }}
-            }}
+                }
+            }
             
-            expandSelectedNode() {{
+            expandSelectedNode() {
                 if (!this.selectedNode) return;
                 
-                const nodePath = this.selectedNode.getAttribute('data-path');
-                const node = this.rootNode.findNodeByPath(nodePath);
-                
-                if (node && !node.expanded) {{
-                    node.toggleExpanded();
-                }}
-            }}
+                if (!this.selectedNode.expanded) {
+                    this.toggleNodeExpansion(this.selectedNode);
+                }
+            }
             
-            collapseSelectedNode() {{
+            collapseSelectedNode() {
                 if (!this.selectedNode) return;
                 
-                const nodePath = this.selectedNode.getAttribute('data-path');
-                const node = this.rootNode.findNodeByPath(nodePath);
-                
-                if (node && node.expanded) {{
-                    node.toggleExpanded();
-                }}
-            }}
+                if (this.selectedNode.expanded) {
+                    this.toggleNodeExpansion(this.selectedNode);
+                }
+            }
             
-            toggleSelectedNodeExpansion() {{
+            toggleSelectedNodeExpansion() {
                 if (!this.selectedNode) return;
                 
-                const nodePath = this.selectedNode.getAttribute('data-path');
-                const node = this.rootNode.findNodeByPath(nodePath);
-                
-                if (node) {{
-                    node.toggleExpanded();
-                }}
-            }}
+                this.toggleNodeExpansion(this.selectedNode);
+            }
             
-            scrollToNode(node) {{
-                node.scrollIntoView({{ behavior: 'smooth', block: 'nearest' }});
-            }}
+            scrollToNode(node) {
+                this.treeView.scrollToNode(node);
+            }
             
-            createContextMenu() {{
+            createContextMenu() {
                 this.contextMenu = document.createElement('div');
                 this.contextMenu.className = 'context-menu';
                 this.contextMenu.innerHTML = `
@@ -1063,39 +1462,38 @@ def generate_javascript(tree_data):
                 
                 // Add event listeners to context menu items
                 this.contextMenu.addEventListener('click', (e) => this.handleContextMenuAction(e));
-            }}
+            }
             
-            showContextMenu(e, treeNode) {{
+            showContextMenu(e, treeNode) {
                 this.contextMenu.style.display = 'block';
                 this.contextMenu.style.left = e.pageX + 'px';
                 this.contextMenu.style.top = e.pageY + 'px';
                 
                 // Store reference to the target node
-                this.contextMenu.setAttribute('data-target-node', treeNode.getAttribute('data-path'));
-            }}
+                this.contextTarget = treeNode;
+            }
             
-            closeContextMenu(e) {{
-                if (this.contextMenu && (!e || !this.contextMenu.contains(e.target))) {{
+            closeContextMenu(e) {
+                if (this.contextMenu && (!e || !this.contextMenu.contains(e.target))) {
                     this.contextMenu.style.display = 'none';
-                }}
-            }}
+                }
+            }
             
-            handleContextMenuAction(e) {{
+            handleContextMenuAction(e) {
                 const menuItem = e.target.closest('.context-menu-item');
                 if (!menuItem) return;
                 
                 const action = menuItem.getAttribute('data-action');
-                const targetPath = this.contextMenu.getAttribute('data-target-node');
-                const node = this.rootNode.findNodeByPath(targetPath);
+                const node = this.contextTarget;
                 
                 if (!node) return;
                 
-                switch (action) {{
+                switch (action) {
                     case 'expand':
-                        if (!node.expanded) node.toggleExpanded();
+                        if (!node.expanded) this.toggleNodeExpansion(node);
                         break;
                     case 'collapse':
-                        if (node.expanded) node.toggleExpanded();
+                        if (node.expanded) this.toggleNodeExpansion(node);
                         break;
                     case 'expand-all':
                         this.expandAllChildren(node);
@@ -1107,213 +1505,282 @@ def generate_javascript(tree_data):
                         this.copyToClipboard(node.path);
                         break;
                     case 'copy-value':
-                        this.copyToClipboard(JSON.stringify(node.getValue(), null, 2));
+                        this.copyToClipboard(node.getJson());
                         break;
-                }}
+                }
                 
                 this.closeContextMenu();
-            }}
-            
-            expandAllChildren(node) {{
-                node.expanded = true;
-                if (node.element) {{
-                    const children = node.element.querySelector('.tree-children');
-                    const toggle = node.element.querySelector('.expand-toggle');
-                    if (children && toggle) {{
-                        children.classList.add('expanded');
-                        toggle.textContent = '▼';
-                    }}
-                }}
-                
-                node.children.forEach(child => this.expandAllChildren(child));
-            }}
-            
-            collapseAllChildren(node) {{
-                node.expanded = false;
-                if (node.element) {{
-                    const children = node.element.querySelector('.tree-children');
-                    const toggle = node.element.querySelector('.expand-toggle');
-                    if (children && toggle) {{
-                        children.classList.remove('expanded');
-                        toggle.textContent = '▶';
-                    }}
-                }}
-                
-                node.children.forEach(child => this.collapseAllChildren(child));
-            }}
+            }
+            
+            expandAllChildren(node) {
+                this.setSubtreeExpanded(node, true);
+            }
             
-            copyToClipboard(text) {{
-                navigator.clipboard.writeText(text).then(() => {{
+            collapseAllChildren(node) {
+                this.setSubtreeExpanded(node, false);
+            }
+            
+            setSubtreeExpanded(node, expanded) {
+                // The subtree is a contiguous range of the layout's expanded flags,
+                // so this is one fill; the view redraws once afterwards
+                node.layout.setSubtreeExpanded(node.index, expanded);
+                this.treeView.scheduleRefresh();
+            }
+            
+            copyToClipboard(text) {
+                navigator.clipboard.writeText(text).then(() => {
                     this.showNotification('Copied to clipboard!');
-                }}).catch(() => {{
+                }).catch(() => {
                     // Fallback for older browsers
-                    const textArea = document.createElement('textarea');
+                    const textArea = this.getCopyTextArea();
                     textArea.value = text;
-                    document.body.appendChild(textArea);
                     textArea.select();
                     document.execCommand('copy');
-                    document.body.removeChild(textArea);
+                    textArea.value = '';
                     this.showNotification('Copied to clipboard!');
-                }});
-            }}
+                });
+            }
+            
+            getCopyTextArea() {
+                // One hidden textarea, attached on first use and reused for every later copy
+                if (!this.copyTextArea) {
+                    this.copyTextArea = document.createElement('textarea');
+                    this.copyTextArea.setAttribute('aria-hidden', 'true');
+                    this.copyTextArea.style.cssText = 'position:fixed;top:0;left:0;opacity:0;pointer-events:none;';
+                    document.body.appendChild(this.copyTextArea);
+                }
+                return this.copyTextArea;
+            }
             
-            showNotification(message) {{
+            showNotification(message) {
                 const notification = document.createElement('div');
                 notification.className = 'notification';
                 notification.textContent = message;
                 document.body.appendChild(notification);
                 
-                setTimeout(() => {{
+                setTimeout(() => {
                     notification.classList.add('show');
-                }}, 100);
+                }, 100);
                 
-                setTimeout(() => {{
+                setTimeout(() => {
                     notification.classList.remove('show');
-                    setTimeout(() => {{
+                    setTimeout(() => {
                         document.body.removeChild(notification);
-                    }}, 300);
-                }}, 2000);
-            }}
+                    }, 300);
+                }, 2000);
+            }
             
-            setupToolbarEvents() {{
+            setupToolbarEvents() {
                 // Expand all button
                 const expandAllBtn = document.getElementById('expand-all-btn');
-                if (expandAllBtn) {{
-                    expandAllBtn.addEventListener('click', () => {{
+                if (expandAllBtn) {
+                    expandAllBtn.addEventListener('click', () => {
                         this.expandAllChildren(this.rootNode);
-                    }});
-                }}
+                    });
+                }
                 
                 // Collapse all button
                 const collapseAllBtn = document.getElementById('collapse-all-btn');
-                if (collapseAllBtn) {{
-                    collapseAllBtn.addEventListener('click', () => {{
+                if (collapseAllBtn) {
+                    collapseAllBtn.addEventListener('click', () => {
                         this.collapseAllChildren(this.rootNode);
-                    }});
-                }}
-            }}
-        }}
+                    });
+                }
+            }
+        }
         
-        // Current selected node and root node
-        let selectedNode = null;
+        // Root node and explorer components
         let rootNode = null;
+        let treeView = null;
         let contentRenderer = null;
         let eventHandler = null;
         
         // Initialize the explorer
-        document.addEventListener('DOMContentLoaded', function() {{
-            initializeExplorer();
-        }});
-        
-        function initializeExplorer() {{
+        document.addEventListener('DOMContentLoaded', function() {
+            jsonDataReady.then(data => {
+                jsonData = inflateTreeData(data);
+                initializeExplorer();
+            });
+        });
+        
+        function initializeExplorer() {
             // Create tree structure from JSON data
             rootNode = TreeNode.createFromData(jsonData);
             
+            // Render the tree; only rows inside the viewport are mounted
+            const treeList = document.getElementById('tree-view');
+            treeView = new FlatTreeView(treeList.parentElement, treeList, rootNode);
+            
             // Initialize content renderer
             const contentView = document.getElementById('content-view');
             contentRenderer = new ContentRenderer().initialize(contentView);
             
             // Initialize event handler
-            eventHandler = new EventHandler().initialize(rootNode, contentRenderer);
+            eventHandler = new EventHandler().initialize(rootNode, contentRenderer, treeView);
             
             // Select root node by default
-            selectNode('root');
-        }}
-        
-        function selectNode(path) {{
-            // Remove previous selection
-            if (selectedNode) {{
-                selectedNode.classList.remove('selected');
-            }}
-            
-            // Add selection to current node
-            const nodeElement = document.querySelector(`[data-path="${{path}}"]`);
-            if (nodeElement) {{
-                const contentElement = nodeElement.querySelector('.tree-node-content');
-                contentElement.classList.add('selected');
-                selectedNode = contentElement;
-            }}
-            
-            // Update content using ContentRenderer
+            eventHandler.selectNode(rootNode);
+        }
+        
+        function selectNode(path) {
             const node = rootNode.findNodeByPath(path);
-            if (node && contentRenderer) {{
-                contentRenderer.render(node);
-            }}
-        }}
+            if (node) {
+                eventHandler.selectNode(node);
+            }
+        }
+    """
+
+def _dumps(obj):
+    """Serialize to compact JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits; fall back to the stdlib
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+def _script_safe(json_text):
+    """
+    Make JSON text safe to embed inside an inline <script> element
+    
+    Every "<" is written as the \\u003c escape, so no payload can form
+    "</script" or "<!--" and change how the HTML tokenizer reads the script.
+    A "<" only occurs inside JSON strings, where the escape is equivalent.
+    """
+    return json_text.replace('<', '\\u003c')
+
+def compact_tree_data(tree_data):
+    """
+    Replace repeated strings in tree data with indexes into a shared table
+    
+    Names, node types and string values repeat heavily in typical JSON, so
+    each distinct string is stored once and nodes refer to it by position.
+    The explorer script inflates the result back into plain tree nodes.
+    
+    Args:
+        tree_data (dict): Tree structure data from prepare_tree_data
         
-        function updateContentView(path) {{
-            const contentView = document.getElementById('content-view');
-            const nodeData = getNodeByPath(jsonData, path);
-            
-            if (nodeData) {{
-                contentView.innerHTML = formatNodeForDisplay(nodeData);
-            }} else {{
-                contentView.innerHTML = '<div class="error">Node not found</div>';
-            }}
-        }}
-        
-        function getNodeByPath(data, path) {{
-            if (path === 'root') return data;
-            
-            // Simple path resolution for demo
-            const parts = path.split('.');
-            let current = data;
-            
-            for (const part of parts) {{
-                if (current && current.children) {{
-                    current = current.children.find(child => child.id === part);
-                }} else {{
-                    return null;
-                }}
-            }}
-            
-            return current;
-        }}
-        
-        function formatNodeForDisplay(node) {{
-            if (!node) return '<div class="error">Node not found</div>';
-            
-            if (node.type === 'primitive') {{
-                return `<div class="json-value">${{formatValue(node.value)}}</div>`;
-            }} else if (node.type === 'object') {{
-                return formatObjectForDisplay(node);
-            }} else if (node.type === 'array') {{
-                return formatArrayForDisplay(node);
-            }} else {{
-                return '<div class="error">Unknown node type</div>';
-            }}
-        }}
-        
-        function formatValue(value) {{
-            if (value === null) return '<span class="json-null">null</span>';
-            if (typeof value === 'boolean') return `<span class="json-boolean">${{value}}</span>`;
-            if (typeof value === 'number') return `<span class="json-number">${{value}}</span>`;
-            if (typeof value === 'string') return `<span class="json-string">"${{value}}"</span>`;
-            return `<span class="json-unknown">${{value}}</span>`;
-        }}
-        
-        function formatObjectForDisplay(node) {{
-            if (!node.children) return '<div class="json-object">{{}}</div>';
-            
-            let html = '<div class="json-object">';
-            node.children.forEach(child => {{
-                html += `<div><span class="json-key">"${{child.name}}"</span>: ${{formatNodeForDisplay(child)}}</div>`;
-            }});
-            html += '</div>';
-            return html;
-        }}
-        
-        function formatArrayForDisplay(node) {{
-            if (!node.children) return '<div class="json-array">[]</div>';
-            
-            let html = '<div class="json-array">';
-            node.children.forEach((child, index) => {{
-                html += `<div class="json-array-item"><span class="json-key">[${{index}}]</span>: ${{formatNodeForDisplay(child)}}</div>`;
-            }});
-            html += '</div>';
-            return html;
-        }}
+    Returns:
+        dict: {'strings': [...], 'tree': compact root node}
+    """
+    strings = []
+    index = {}
+    
+    def intern(text):
+        position = index.get(text)
+        if position is None:
+            position = index[text] = len(strings)
+            strings.append(text)
+        return position
+    
+    root = {'c': []}
+    stack = [(tree_data, root['c'])]
+    
+    while stack:
+        node, siblings = stack.pop()
+        # Node ids are full paths; the script derives them from names instead
+        compact = {'n': intern(node['name']), 't': intern(node['type'])}
+        if node['expanded']:
+            compact['e'] = 1
+        if 'value' in node:
+            value = node['value']
+            if isinstance(value, str):
+                compact['s'] = intern(value)
+            else:
+                compact['v'] = value
+        siblings.append(compact)
+        
+        if node['children']:
+            children = compact['c'] = []
+            # Push in reverse so children keep document order
+            for child in reversed(node['children']):
+                stack.append((child, children))
+    
+    return {'strings': strings, 'tree': root['c'][0]}
+
+def generate_javascript(tree_data, compress=False):
+    """
+    Generate JavaScript for interactivity
+    
+    Args:
+        tree_data (dict): Tree structure data
+        compress (bool): Embed the data gzip-compressed and base64-encoded,
+            inflating it in the browser with DecompressionStream
+        
+    Returns:
+        str: Script source
+    """
+    return ''.join(iter_javascript(tree_data, compress))
+
+def iter_javascript(tree_data, compress=False, data_url=None):
+    """
+    Yield the explorer script as fragments, without joining the large
+    data literal and the static template into one string
+    
+    Args:
+        tree_data (dict): Tree structure data
+        compress (bool): Embed the data gzip-compressed and base64-encoded
+        data_url (str, optional): Fetch the data from this URL instead of
+            embedding it; takes precedence over compress
+        
+    Yields:
+        str: Consecutive pieces of the script source
+    """
+    yield from iter_javascript_data(tree_data, compress, data_url)
+    yield _JS_TEMPLATE
+
+def iter_javascript_data(tree_data, compress=False, data_url=None):
     """
+    Yield the script fragments that define jsonData and jsonDataReady
+    
+    Args:
+        tree_data (dict): Tree structure data
+        compress (bool): Embed the data gzip-compressed and base64-encoded
+        data_url (str, optional): Fetch the data from this URL instead of
+            embedding it; takes precedence over compress
+        
+    Yields:
+        str: Consecutive pieces of the data script source
+    """
+    if data_url is not None:
+        yield """
+        // Store the complete JSON data (fetched from the sidecar file)
+        let jsonData = null;
+        const jsonDataReady = fetch("""
+        yield _script_safe(json.dumps(data_url))
+        yield """).then(response => response.json());
+"""
+        return
+    
+    payload_data = compact_tree_data(tree_data)
+    
+    if compress:
+        raw = _dumps(payload_data).encode('utf-8')
+        # GzipFile rather than gzip.compress(mtime=...), which needs Python 3.8
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as gz:
+            gz.write(raw)
+        payload = base64.b64encode(buffer.getvalue()).decode('ascii')
+        yield """
+        // Store the complete JSON data (gzip + base64, inflated on load)
+        let jsonData = null;
+        const jsonDataReady = (async () => {
+            const bytes = Uint8Array.from(atob('"""
+        yield payload
+        yield """'), c => c.charCodeAt(0));
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(stream).text());
+        })();
+"""
+    else:
+        # JSON is valid JavaScript, so embed it as a literal
+        yield """
+        // Store the complete JSON data
+        let jsonData = """
+        yield _script_safe(_dumps(payload_data))
+        yield """;
+        const jsonDataReady = Promise.resolve(jsonData);
+"""
 
 def format_file_size(size_bytes):
     """Format file size in human readable format"""
@@ -1340,12 +1807,166 @@ def write_html_file(html_content, output_path, config=None):
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # One UTF-8 encode pass and a binary write, bypassing the text-mode encoder
+        output_path.write_bytes(html_content.encode('utf-8'))
+        write_explorer_assets(output_path.parent, config)
+        
+        if (config or {}).get('precompress', False):
+            write_precompressed(output_path)
         
         logger.info(f"HTML file written successfully: {output_path}")
         return True
         
     except Exception as e:
         logger.error(f"Error writing HTML file: {e}")
-        return False 
\ No newline at end of file
+        return False
+
+def write_interactive_html(json_data, output_path, config=None):
+    """
+    Generate the HTML explorer and stream it straight to a file
+    
+    Args:
+        json_data (dict): Parsed JSON data from json_parser
+        output_path (str or Path): Output file path
+        config (dict, optional): Configuration options
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        data_path = None
+        if (config or {}).get('external_data', False):
+            data_path = output_path.with_suffix('.data.json')
+        
+        # Generation can fail partway through the stream; the page only
+        # takes the place of the output once it is complete
+        temp_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                create_interactive_html_stream(json_data, f, config, data_path)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        
+        write_explorer_assets(output_path.parent, config)
+        
+        if (config or {}).get('precompress', False):
+            write_precompressed(output_path)
+            if data_path is not None:
+                # The sidecar holds the tree data, usually the largest file
+                write_precompressed(data_path)
+        
+        logger.info(f"HTML file written successfully: {output_path}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error writing HTML file: {e}")
+        return False
+
+def write_explorer_assets(output_dir, config=None):
+    """
+    Write the shared stylesheet and script that the page links instead of inlining
+    
+    Args:
+        output_dir (str or Path): Directory containing the HTML output
+        config (dict, optional): Configuration options
+        
+    Returns:
+        list: Paths of the assets the page links to
+    """
+    if config is None:
+        config = {}
+    
+    assets = []
+    if not config.get('inline_css', True):
+        assets.append(write_css_asset(output_dir))
+    if not config.get('inline_js', True):
+        assets.append(write_js_asset(output_dir))
+    return assets
+
+def write_css_asset(output_dir):
+    """
+    Write the shared stylesheet next to the generated HTML files
+    
+    The file is only rewritten when missing or out of date, so many explorers
+    in one directory share a single browser-cached copy.
+    
+    Args:
+        output_dir (str or Path): Directory containing the HTML output
+        
+    Returns:
+        Path: Path of the stylesheet
+    """
+    return _write_asset(Path(output_dir) / CSS_ASSET_NAME, generate_css())
+
+def write_js_asset(output_dir):
+    """
+    Write the shared explorer script next to the generated HTML files
+    
+    Like the stylesheet, it is only rewritten when missing or out of date.
+    
+    Args:
+        output_dir (str or Path): Directory containing the HTML output
+        
+    Returns:
+        Path: Path of the script
+    """
+    return _write_asset(Path(output_dir) / JS_ASSET_NAME, _JS_TEMPLATE)
+
+def _write_asset(asset_path, content):
+    """Write a static asset unless an identical copy is already there"""
+    if not asset_path.exists() or asset_path.read_text(encoding='utf-8') != content:
+        asset_path.write_text(content, encoding='utf-8')
+        logger.info(f"Asset written: {asset_path}")
+    return asset_path
+
+def write_data_file(tree_data, data_path):
+    """
+    Write the explorer's tree data as a standalone JSON file
+    
+    Args:
+        tree_data (dict): Tree structure data
+        data_path (str or Path): Output file path
+        
+    Returns:
+        Path: Path of the data file
+    """
+    data_path = Path(data_path)
+    data_path.write_text(_dumps(compact_tree_data(tree_data)), encoding='utf-8')
+    logger.info(f"Data file written: {data_path}")
+    return data_path
+
+def write_precompressed(path):
+    """
+    Write maximum-level .gz (and .br, when brotli is installed) copies of a file
+    
+    Static servers can hand these out directly instead of compressing the
+    page on every request.
+    
+    Args:
+        path (str or Path): File to precompress
+        
+    Returns:
+        list: Paths of the compressed files written
+    """
+    path = Path(path)
+    content = path.read_bytes()
+    written = []
+    
+    gz_path = path.with_name(path.name + '.gz')
+    with open(gz_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as gz:
+        gz.write(content)
+    written.append(gz_path)
+    
+    if brotli is not None:
+        br_path = path.with_name(path.name + '.br')
+        br_path.write_bytes(brotli.compress(content, quality=11))
+        written.append(br_path)
+    
+    logger.info(f"Precompressed copies written: {', '.join(p.name for p in written)}")
+    return written
@@ -4,24 +4,100 @@ Input Detector for JSON to HTML Explorer Tool
 Detects and validates JSON input files
 """
 
+import errno
 import json
+import mmap
+import os
+import re
+import stat
+from collections import deque
 from pathlib import Path
 from loguru import logger
 
-def get_input_info(input_path):
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib parser is used otherwise
+    orjson = None
+
+# Inputs at least this large are memory-mapped instead of read into memory
+_MMAP_MIN_SIZE = 1024 * 1024
+
+# stat() errors that Path.exists() reports as a missing path, as in pathlib
+_MISSING_ERRNOS = frozenset((errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP))
+
+# Stands in for the object key of the root value and of list items, so that
+# None remains a real (invalid) key for validate_json_structure to report
+_NO_KEY = object()
+
+# Line number in a json.JSONDecodeError message
+_ERROR_LINE_RE = re.compile(r'line (\d+)')
+
+def load_json_file(file_path):
+    """
+    Read and parse a UTF-8 JSON file, using orjson when it is installed
+    
+    Args:
+        file_path (str or Path): Path to JSON file
+        
+    Returns:
+        Parsed JSON data
+        
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    file_path = Path(file_path)
+    if orjson is not None:
+        # orjson parses raw UTF-8 bytes, so nothing is decoded up front and
+        # large files are handed over as a read-only mapping instead of a copy
+        try:
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                size = os.fstat(fd).st_size
+                if size < _MMAP_MIN_SIZE:
+                    return orjson.loads(_read_fd(fd, size))
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    return orjson.loads(view)
+            finally:
+                os.close(fd)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (NaN, integers wider than 64 bits); let the
+            # stdlib decide, which also keeps its error messages and positions
+            pass
+    
+    # Decoding first keeps encoding problems reported as UnicodeDecodeError
+    return json.loads(file_path.read_bytes().decode('utf-8'))
+
+def _read_fd(fd, size):
+    """Read a file of known size straight from its descriptor, without buffering layers"""
+    data = os.read(fd, size)
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+def get_input_info(input_path, analyze=True):
     """
     Detect and validate JSON input file
     
     Args:
         input_path (str or Path): Path to input file
+        analyze (bool): Also run the structure analysis; when False the
+            'structure' entry is None and only validation walks the data
         
     Returns:
         dict: Input information including type, validation status, and details
     """
     input_path = Path(input_path)
     
+    # One stat call answers existence, file type and size
+    file_stat = _stat_or_none(input_path)
+    
     # Check if path exists
-    if not input_path.exists():
+    if file_stat is None:
         return {
             'type': 'unknown',
             'validation': 'error',
@@ -31,7 +107,7 @@ def get_input_info(input_path):
         }
     
     # Check if it's a file (not directory)
-    if not input_path.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         return {
             'type': 'unknown',
             'validation': 'error',
@@ -41,7 +117,7 @@ def get_input_info(input_path):
         }
     
     # Check file size
-    file_size = input_path.stat().st_size
+    file_size = file_stat.st_size
     if file_size == 0:
         return {
             'type': 'json',
@@ -73,8 +149,7 @@ def get_input_info(input_path):
     
     # Try to parse JSON to validate
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        json_data = load_json_file(input_path)
         
         # Validate JSON structure
         validation_result = validate_json_structure(json_data)
@@ -88,7 +163,7 @@ def get_input_info(input_path):
             }
         
         # Analyze JSON structure
-        structure_info = analyze_json_structure(json_data)
+        structure_info = analyze_json_structure(json_data) if analyze else None
         
         return {
             'type': 'json',
@@ -97,6 +172,7 @@ def get_input_info(input_path):
             'size': file_size,
             'structure': structure_info,
             'data': json_data,
+            'total_elements': validation_result['total_elements'],
             'warnings': validation_result.get('warnings', [])
         }
         
@@ -134,46 +210,85 @@ def get_input_info(input_path):
             'error_code': 'UNEXPECTED_ERROR'
         }
 
+def _stat_or_none(path):
+    """Stat a path, or return None where Path.exists() would call it missing"""
+    try:
+        return path.stat()
+    except OSError as e:
+        if e.errno not in _MISSING_ERRNOS:
+            raise
+        return None
+
 def analyze_json_structure(data, max_depth=3, current_depth=0):
     """
     Analyze JSON structure to provide insights about the data
     
+    Works breadth-first from a work queue instead of recursing, so each
+    nested value costs a queue entry rather than a Python call frame.
+    
     Args:
         data: JSON data to analyze
         max_depth: Maximum depth to analyze
-        current_depth: Current depth in recursion
+        current_depth: Depth of data within the document
         
     Returns:
         dict: Structure analysis information
     """
-    if current_depth >= max_depth:
-        return {'type': 'truncated', 'depth': current_depth}
+    root = {}
+    # FIFO of (value, depth, summary dict); a value's summary slot is created
+    # by its parent, so the result tree needs no assembly afterwards
+    work = deque([(data, current_depth, root)])
     
-    if isinstance(data, dict):
-        return {
-            'type': 'object',
-            'keys': list(data.keys()),
-            'key_count': len(data),
-            'children': {
-                key: analyze_json_structure(value, max_depth, current_depth + 1)
-                for key, value in data.items()
-            } if current_depth < max_depth - 1 else None
-        }
-    elif isinstance(data, list):
-        return {
-            'type': 'array',
-            'length': len(data),
-            'sample_items': [
-                analyze_json_structure(item, max_depth, current_depth + 1)
-                for item in data[:3]  # Sample first 3 items
-            ] if data and current_depth < max_depth - 1 else None
-        }
-    else:
-        return {
-            'type': 'primitive',
-            'value_type': type(data).__name__,
-            'sample_value': str(data)[:100] if data is not None else None
-        }
+    while work:
+        value, depth, info = work.popleft()
+        
+        if depth >= max_depth:
+            info.update({'type': 'truncated', 'depth': depth})
+            continue
+        
+        expand = depth < max_depth - 1
+        # Objects queue every key and arrays their first three items; type()
+        # suffices since json.loads never returns dict or list subclasses
+        kind = type(value)
+        if kind is dict:
+            children = None
+            if expand:
+                children = {}
+                for key, item in value.items():
+                    slot = children[key] = {}
+                    work.append((item, depth + 1, slot))
+            info.update({
+                'type': 'object',
+                'keys': list(value.keys()),
+                'key_count': len(value),
+                'children': children
+            })
+        elif kind is list:
+            samples = None
+            if value and expand:
+                samples = []
+                for item in value[:3]:  # Sample first 3 items
+                    slot = {}
+                    samples.append(slot)
+                    work.append((item, depth + 1, slot))
+            info.update({
+                'type': 'array',
+                'length': len(value),
+                'sample_items': samples
+            })
+        else:
+            # Slice strings directly instead of copying them whole through str()
+            if kind is str:
+                sample = value[:100]
+            else:
+                sample = str(value)[:100] if value is not None else None
+            info.update({
+                'type': 'primitive',
+                'value_type': type(value).__name__,
+                'sample_value': sample
+            })
+    
+    return root
 
 def validate_json_file(file_path):
     """
@@ -186,8 +301,7 @@ def validate_json_file(file_path):
         tuple: (is_valid, error_message)
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json.load(f)
+        load_json_file(file_path)
         return True, None
     except json.JSONDecodeError as e:
         return False, f"JSON decode error: {str(e)}"
@@ -198,93 +312,104 @@ def validate_json_structure(data, max_depth=50, current_depth=0):
     """
     Validate JSON structure for potential issues
     
+    A single pass over every value, driven by an explicit stack, that also
+    counts the elements so callers do not need a second full traversal.
+    
     Args:
         data: JSON data to validate
         max_depth: Maximum allowed nesting depth
-        current_depth: Current depth in recursion
+        current_depth: Depth of data within the document
         
     Returns:
-        dict: Validation result with is_valid, error, and warnings
+        dict: Validation result with is_valid, error, warnings and
+            total_elements (counted up to the first error)
     """
     warnings = []
+    total = 0
+    # Each entry is (object key or _NO_KEY, value, depth); keys are checked
+    # just before their value so warnings keep document order
+    stack = [(_NO_KEY, data, current_depth)]
     
-    # Check for excessive nesting
-    if current_depth > max_depth:
-        return {
-            'is_valid': False,
-            'error': f'JSON structure is too deeply nested (max {max_depth} levels)',
-            'warnings': warnings
-        }
-    
-    if isinstance(data, dict):
-        # Check for empty objects
-        if not data:
-            warnings.append('Empty object detected')
-        
-        # Check for very large objects
-        if len(data) > 10000:
-            warnings.append(f'Large object detected with {len(data)} keys')
+    while stack:
+        key, value, depth = stack.pop()
         
-        # Validate each key-value pair
-        for key, value in data.items():
+        if key is not _NO_KEY:
             # Check for invalid key types
             if not isinstance(key, str):
-                return {
-                    'is_valid': False,
-                    'error': f'Invalid key type: {type(key).__name__}. Only string keys are allowed.',
-                    'warnings': warnings
-                }
+                return _invalid_structure(
+                    f'Invalid key type: {type(key).__name__}. Only string keys are allowed.',
+                    warnings, total)
             
             # Check for very long keys
             if len(key) > 1000:
                 warnings.append(f'Very long key detected: {key[:50]}...')
-            
-            # Recursively validate values
-            result = validate_json_structure(value, max_depth, current_depth + 1)
-            if not result['is_valid']:
-                return result
-            warnings.extend(result.get('warnings', []))
-            
-    elif isinstance(data, list):
-        # Check for empty arrays
-        if not data:
-            warnings.append('Empty array detected')
         
-        # Check for very large arrays
-        if len(data) > 100000:
-            warnings.append(f'Large array detected with {len(data)} items')
+        # Check for excessive nesting
+        if depth > max_depth:
+            return _invalid_structure(
+                f'JSON structure is too deeply nested (max {max_depth} levels)',
+                warnings, total)
+        
+        total += 1
         
-        # Validate each item
-        for i, item in enumerate(data):
-            result = validate_json_structure(item, max_depth, current_depth + 1)
-            if not result['is_valid']:
-                return result
-            warnings.extend(result.get('warnings', []))
+        if isinstance(value, dict):
+            # Check for empty objects
+            if not value:
+                warnings.append('Empty object detected')
             
-    elif isinstance(data, str):
-        # Check for very long strings
-        if len(data) > 1000000:
-            warnings.append(f'Very long string detected ({len(data)} characters)')
+            # Check for very large objects
+            if len(value) > 10000:
+                warnings.append(f'Large object detected with {len(value)} keys')
             
-    elif isinstance(data, (int, float)):
-        # Check for very large numbers
-        if abs(data) > 1e15:
-            warnings.append(f'Very large number detected: {data}')
+            # Validate each key-value pair, pushed in reverse to pop in order
+            for item_key, item in reversed(list(value.items())):
+                stack.append((item_key, item, depth + 1))
+                
+        elif isinstance(value, list):
+            # Check for empty arrays
+            if not value:
+                warnings.append('Empty array detected')
             
-    elif data is None:
-        # null values are fine
-        pass
-        
-    else:
-        return {
-            'is_valid': False,
-            'error': f'Unsupported data type: {type(data).__name__}',
-            'warnings': warnings
-        }
+            # Check for very large arrays
+            if len(value) > 100000:
+                warnings.append(f'Large array detected with {len(value)} items')
+            
+            # Validate each item
+            for i in range(len(value) - 1, -1, -1):
+                stack.append((_NO_KEY, value[i], depth + 1))
+                
+        elif isinstance(value, str):
+            # Check for very long strings
+            if len(value) > 1000000:
+                warnings.append(f'Very long string detected ({len(value)} characters)')
+                
+        elif isinstance(value, (int, float)):
+            # Check for very large numbers
+            if abs(value) > 1e15:
+                warnings.append(f'Very large number detected: {value}')
+                
+        elif value is None:
+            # null values are fine
+            pass
+            
+        else:
+            return _invalid_structure(
+                f'Unsupported data type: {type(value).__name__}',
+                warnings, total)
     
     return {
         'is_valid': True,
-        'warnings': warnings
+        'warnings': warnings,
+        'total_elements': total
+    }
+
+def _invalid_structure(error, warnings, total):
+    """Build the validate_json_structure result for a failed check"""
+    return {
+        'is_valid': False,
+        'error': error,
+        'warnings': warnings,
+        'total_elements': total
     }
 
 def get_json_error_line(error_message):
@@ -297,8 +422,7 @@ def get_json_error_line(error_message):
     Returns:
         int or None: Line number if found
     """
-    import re
-    match = re.search(r'line (\d+)', error_message)
+    match = _ERROR_LINE_RE.search(error_message)
     if match:
         return int(match.group(1))
     return None
@@ -324,15 +448,16 @@ def get_json_file_info(file_path):
     """
     file_path = Path(file_path)
     
-    if not file_path.exists():
+    file_stat = _stat_or_none(file_path)
+    if file_stat is None:
         return {'error': 'File does not exist'}
+    file_size = file_stat.st_size
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json_file(file_path)
         
         return {
-            'file_size': file_path.stat().st_size,
+            'file_size': file_size,
             'encoding': 'utf-8',
             'structure': analyze_json_structure(data),
             'root_type': type(data).__name__,
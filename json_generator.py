@@ -4,24 +4,39 @@ JSON Generator Module
 Converts internal data structures to JSON output optimized for LLM parsing
 """
 
+import itertools
 import json
+import math
+import os
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
 
-def convert_to_json_format(internal_data):
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib serializer is used otherwise
+    orjson = None
+
+def convert_to_json_format(internal_data, generated_at=None):
     """
     Convert internal data structure to JSON format
     
     Args:
         internal_data (dict): Internal data structure from parser
+        generated_at (str, optional): ISO timestamp to record; taken from
+            the clock when omitted
         
     Returns:
         dict: JSON-formatted data
     """
-    json_data = {
+    # Comprehensions build each list at its final size instead of appending
+    files = [_file_to_json(file_data) for file_data in internal_data.get('files', [])]
+    if generated_at is None:
+        generated_at = datetime.now().isoformat()
+    
+    return {
         'metadata': {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': generated_at,
             'version': '2.0',
             'format': 'json',
             'optimized_for': 'llm_parsing'
@@ -31,61 +46,53 @@ def convert_to_json_format(internal_data):
             'version': internal_data.get('version', '1.0'),
             'source_type': internal_data.get('source_type', 'unknown'),
             'source_path': internal_data.get('source_path', ''),
-            'total_files': len(internal_data.get('files', [])),
-            'total_sections': 0
+            'total_files': len(files),
+            'total_sections': sum(len(file_json['sections']) for file_json in files)
         },
         'content': {
-            'files': []
+            'files': files
         }
     }
-    
-    # Process files
-    for file_data in internal_data.get('files', []):
-        file_json = {
-            'id': file_data.get('id', ''),
-            'name': file_data.get('name', ''),
-            'path': file_data.get('path', ''),
-            'sections': []
-        }
-        
-        # Process sections
-        for section in file_data.get('sections', []):
-            section_json = {
-                'id': section.get('id', ''),
-                'title': section.get('title', ''),
-                'level': section.get('level', 1),
-                'content': section.get('content', ''),
-                'subsections': []
+
+def _file_to_json(file_data):
+    """Convert one parsed file and its sections to JSON format"""
+    get = file_data.get
+    return {
+        'id': get('id', ''),
+        'name': get('name', ''),
+        'path': get('path', ''),
+        'sections': [_section_to_json(section) for section in get('sections', [])]
+    }
+
+def _section_to_json(section):
+    """Convert one section and its subsections to JSON format"""
+    get = section.get
+    return {
+        'id': get('id', ''),
+        'title': get('title', ''),
+        'level': get('level', 1),
+        'content': get('content', ''),
+        'subsections': [_subsection_to_json(subsection) for subsection in get('subsections', [])]
+    }
+
+def _subsection_to_json(subsection):
+    """Convert one subsection and its sub-subsections to JSON format"""
+    get = subsection.get
+    return {
+        'id': get('id', ''),
+        'title': get('title', ''),
+        'level': get('level', 2),
+        'content': get('content', ''),
+        'subsubsections': [
+            {
+                'id': subsubsection.get('id', ''),
+                'title': subsubsection.get('title', ''),
+                'level': subsubsection.get('level', 3),
+                'content': subsubsection.get('content', '')
             }
-            
-            # Process subsections
-            for subsection in section.get('subsections', []):
-                subsection_json = {
-                    'id': subsection.get('id', ''),
-                    'title': subsection.get('title', ''),
-                    'level': subsection.get('level', 2),
-                    'content': subsection.get('content', ''),
-                    'subsubsections': []
-                }
-                
-                # Process sub-subsections
-                for subsubsection in subsection.get('subsubsections', []):
-                    subsubsection_json = {
-                        'id': subsubsection.get('id', ''),
-                        'title': subsubsection.get('title', ''),
-                        'level': subsubsection.get('level', 3),
-                        'content': subsubsection.get('content', '')
-                    }
-                    subsection_json['subsubsections'].append(subsubsection_json)
-                
-                section_json['subsections'].append(subsection_json)
-            
-            file_json['sections'].append(section_json)
-            json_data['documentation']['total_sections'] += 1
-        
-        json_data['content']['files'].append(file_json)
-    
-    return json_data
+            for subsubsection in get('subsubsections', [])
+        ]
+    }
 
 def create_json_document(data, config=None):
     """
@@ -96,36 +103,96 @@ def create_json_document(data, config=None):
         config (dict, optional): Configuration options
         
     Returns:
-        str: Formatted JSON string
+        bytes: Formatted UTF-8 JSON document
     """
     if config is None:
         config = {}
     
     # Convert to JSON format
-    json_data = convert_to_json_format(data)
+    json_data = convert_to_json_format(data, config.get('generated_at'))
+    
+    # Generate JSON document
+    return encode_json(json_data, config)
+
+def encode_json(json_data, config=None):
+    """
+    Serialize data to UTF-8 JSON bytes using the configured formatting
+    
+    orjson is used when installed and it can produce the same layout
+    (2-space or no indentation, non-ASCII kept as is); otherwise, or for
+    data orjson rejects, the stdlib serializer is used. Data holding NaN or
+    infinite floats also goes to the stdlib, which writes NaN and Infinity
+    where orjson would write null. The two serializers still format float
+    exponents differently: orjson writes 1e16 where json.dumps writes 1e+16.
+    
+    Args:
+        json_data: Data to serialize
+        config (dict, optional): Configuration options
+        
+    Returns:
+        bytes: Encoded JSON document
+    """
+    options = _json_options(config)
+    content = _orjson_encode(json_data, *options)
+    if content is None:
+        content = _stdlib_encoder(*options).encode(json_data).encode('utf-8')
+    return content
+
+def _json_options(config):
+    """Return (indent, sort_keys, ensure_ascii) from configuration options"""
+    if config is None:
+        config = {}
+    return (
+        config.get('indent', 2),
+        config.get('sort_keys', False),
+        config.get('ensure_ascii', False)
+    )
+
+def _orjson_encode(json_data, indent, sort_keys, ensure_ascii):
+    """Encode with orjson, or return None when it cannot match the stdlib output"""
+    if orjson is None or indent not in (2, None) or ensure_ascii:
+        return None
     
-    # Apply configuration options
-    indent = config.get('indent', 2)
-    sort_keys = config.get('sort_keys', False)
-    ensure_ascii = config.get('ensure_ascii', False)
+    if _has_non_finite_float(json_data):
+        return None
     
-    # Generate JSON string
-    json_string = json.dumps(
-        json_data, 
+    option = orjson.OPT_INDENT_2 if indent == 2 else 0
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        return orjson.dumps(json_data, option=option)
+    except orjson.JSONEncodeError:
+        return None  # e.g. non-string keys or integers wider than 64 bits
+
+def _has_non_finite_float(json_data):
+    """Return True if the data contains a NaN or infinite float anywhere"""
+    stack = [json_data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, float) and not math.isfinite(value):
+            return True
+    return False
+
+def _stdlib_encoder(indent, sort_keys, ensure_ascii):
+    """Build the stdlib encoder for the configured formatting"""
+    return json.JSONEncoder(
         indent=indent, 
         sort_keys=sort_keys, 
         ensure_ascii=ensure_ascii,
         separators=(',', ': ') if indent else (',', ':')
     )
-    
-    return json_string
 
 def write_json_file(json_data, output_path, config=None):
     """
     Write JSON data to file
     
     Args:
-        json_data (str or dict): JSON data to write
+        json_data (dict, str or bytes): Data to serialize, or an already
+            encoded document such as create_json_document returns
         output_path (str or Path): Output file path
         config (dict, optional): Configuration options
         
@@ -138,27 +205,33 @@ def write_json_file(json_data, output_path, config=None):
         # Create output directory if it doesn't exist
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # If json_data is a dict, convert to JSON string
         if isinstance(json_data, dict):
-            # Apply configuration options
-            indent = config.get('indent', 2) if config else 2
-            sort_keys = config.get('sort_keys', False) if config else False
-            ensure_ascii = config.get('ensure_ascii', False) if config else False
-            
-            # Generate JSON string
-            json_string = json.dumps(
-                json_data, 
-                indent=indent, 
-                sort_keys=sort_keys, 
-                ensure_ascii=ensure_ascii,
-                separators=(',', ': ') if indent else (',', ':')
-            )
+            options = _json_options(config)
+            content = _orjson_encode(json_data, *options)
+            if content is None and options[0]:
+                # Indented output goes through the stdlib's Python encoder
+                # either way, so stream its chunks instead of joining them
+                encoder = _stdlib_encoder(*options)
+                # Encoding errors can surface mid-stream, so the chunks go to a
+                # sibling file that only replaces the output once complete
+                temp_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+                try:
+                    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                        f.writelines(encoder.iterencode(json_data))
+                    os.replace(temp_path, output_path)
+                except BaseException:
+                    if temp_path.exists():
+                        temp_path.unlink()
+                    raise
+            else:
+                if content is None:
+                    # Compact output keeps the one-shot C encoder
+                    content = _stdlib_encoder(*options).encode(json_data).encode('utf-8')
+                output_path.write_bytes(content)
+        elif isinstance(json_data, bytes):
+            output_path.write_bytes(json_data)
         else:
-            json_string = json_data
-        
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(json_string)
+            output_path.write_bytes(json_data.encode('utf-8'))
         
         logger.info(f"JSON file written: {output_path}")
         return True
@@ -167,107 +240,110 @@ def write_json_file(json_data, output_path, config=None):
         logger.error(f"Failed to write JSON file {output_path}: {e}")
         return False
 
-def create_llm_optimized_json(internal_data, config=None):
+def create_llm_optimized_json(internal_data, config=None, generated_at=None):
     """
     Create JSON optimized specifically for LLM parsing with folder structure
     
     Args:
         internal_data (dict): Internal data structure with folder hierarchy
         config (dict, optional): Configuration options
+        generated_at (str, optional): ISO timestamp to record; taken from
+            the clock when omitted
         
     Returns:
         dict: LLM-optimized JSON structure with folder organization
     """
     if config is None:
         config = {}
+    if generated_at is None:
+        generated_at = datetime.now().isoformat()
     
     # LLM-optimized structure with folder hierarchy
     llm_json = {
         'instructions': {
             'format': 'json',
             'version': '2.0',
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': generated_at,
             'source': internal_data.get('source_type', 'unknown'),
             'total_instructions': 0
         },
         'folders': []
     }
     
-    # Process folder structure
-    section_counter = 0
+    # Ids are handed out in document order from one shared counter; each
+    # dict takes its id before its children are built
+    counter = itertools.count(1)
+    folders = []
     
     for folder_data in internal_data.get('folders', []):
-        folder_json = {
-            'id': folder_data.get('id', ''),
-            'name': folder_data.get('name', ''),
-            'order': folder_data.get('order', 0),
-            'files': []
-        }
+        folder_name = folder_data.get('name', '')
+        files = []
         
         # Process files within this folder
         for file_data in folder_data.get('files', []):
-            file_json = {
-                'id': file_data.get('id', ''),
-                'name': file_data.get('name', ''),
-                'path': file_data.get('path', ''),
-                'sections': []
-            }
+            file_name = file_data.get('name', '')
+            sections = []
             
             # Process sections within this file
             for section in file_data.get('sections', []):
-                section_counter += 1
+                section_title = section.get('title', '')
                 
                 # Main section
                 llm_section = {
-                    'id': f"{section_counter}",
+                    'id': str(next(counter)),
                     'type': 'section',
-                    'title': section.get('title', ''),
+                    'title': section_title,
                     'content': section.get('content', ''),
-                    'file': file_data.get('name', ''),
-                    'folder': folder_data.get('name', ''),
+                    'file': file_name,
+                    'folder': folder_name,
                     'subsections': []
                 }
                 
-                # Subsections
-                for subsection in section.get('subsections', []):
-                    section_counter += 1
-                    
-                    llm_subsection = {
-                        'id': f"{section_counter}",
+                # Subsections and their sub-subsections
+                llm_section['subsections'] = [
+                    {
+                        'id': str(next(counter)),
                         'type': 'subsection',
                         'title': subsection.get('title', ''),
                         'content': subsection.get('content', ''),
-                        'parent_section': section.get('title', ''),
-                        'file': file_data.get('name', ''),
-                        'folder': folder_data.get('name', ''),
-                        'subsubsections': []
+                        'parent_section': section_title,
+                        'file': file_name,
+                        'folder': folder_name,
+                        'subsubsections': [
+                            {
+                                'id': str(next(counter)),
+                                'type': 'subsubsection',
+                                'title': subsubsection.get('title', ''),
+                                'content': subsubsection.get('content', ''),
+                                'parent_subsection': subsection.get('title', ''),
+                                'parent_section': section_title,
+                                'file': file_name,
+                                'folder': folder_name
+                            }
+                            for subsubsection in subsection.get('subsubsections', [])
+                        ]
                     }
-                    
-                    # Sub-subsections
-                    for subsubsection in subsection.get('subsubsections', []):
-                        section_counter += 1
-                        
-                        llm_subsubsection = {
-                            'id': f"{section_counter}",
-                            'type': 'subsubsection',
-                            'title': subsubsection.get('title', ''),
-                            'content': subsubsection.get('content', ''),
-                            'parent_subsection': subsection.get('title', ''),
-                            'parent_section': section.get('title', ''),
-                            'file': file_data.get('name', ''),
-                            'folder': folder_data.get('name', '')
-                        }
-                        
-                        llm_subsection['subsubsections'].append(llm_subsubsection)
-                    
-                    llm_section['subsections'].append(llm_subsection)
+                    for subsection in section.get('subsections', [])
+                ]
                 
-                file_json['sections'].append(llm_section)
+                sections.append(llm_section)
             
-            folder_json['files'].append(file_json)
+            files.append({
+                'id': file_data.get('id', ''),
+                'name': file_name,
+                'path': file_data.get('path', ''),
+                'sections': sections
+            })
         
-        llm_json['folders'].append(folder_json)
+        folders.append({
+            'id': folder_data.get('id', ''),
+            'name': folder_name,
+            'order': folder_data.get('order', 0),
+            'files': files
+        })
     
-    llm_json['instructions']['total_instructions'] = section_counter
+    llm_json['folders'] = folders
+    # The counter's next value is one past the last id handed out
+    llm_json['instructions']['total_instructions'] = next(counter) - 1
     
     return llm_json 
\ No newline at end of file
@@ -5,16 +5,37 @@ Parses JSON files and prepares data for HTML generation
 """
 
 import json
+import re
+from collections import deque
 from pathlib import Path
 from loguru import logger
+from input_detector import load_json_file
 
-def parse_json_file(file_path, config=None):
+# Container types produced by the JSON parser
+_CONTAINER_TYPES = (dict, list)
+
+# Single-pass translation table for escaping text interpolated into HTML
+_HTML_ESC = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+# Separators between the parts of a node path such as "items[0].title"
+_PATH_SPLIT_RE = re.compile(r'\.|\[|\]')
+
+def parse_json_file(file_path, config=None, data=None, total_elements=None):
     """
     Parse JSON file and prepare data for HTML generation
     
     Args:
         file_path (str or Path): Path to JSON file
         config (dict, optional): Configuration options
+        data (optional): Already parsed content of the file, e.g. the 'data'
+            returned by get_input_info; the file is parsed when omitted
+        total_elements (int, optional): Element count already known for data
         
     Returns:
         dict: Parsed JSON data with metadata
@@ -25,9 +46,10 @@ def parse_json_file(file_path, config=None):
     file_path = Path(file_path)
     
     try:
-        # Read and parse JSON file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        # Read and parse JSON file (orjson when installed) unless already done
+        json_data = data if data is not None else load_json_file(file_path)
+        if data is None or total_elements is None:
+            total_elements = count_elements(json_data)
         
         # Analyze the JSON structure
         structure_analysis = analyze_json_structure(json_data)
@@ -41,7 +63,7 @@ def parse_json_file(file_path, config=None):
                 'file_size': file_path.stat().st_size,
                 'structure': structure_analysis,
                 'root_type': type(json_data).__name__,
-                'total_elements': count_elements(json_data)
+                'total_elements': total_elements
             }
         }
         
@@ -62,49 +84,78 @@ def analyze_json_structure(data, max_depth=10, current_depth=0):
     """
     Analyze JSON structure for HTML generation
     
+    Works from a work list instead of recursing; each value's result dict is
+    attached to its parent first and filled in when the value is reached.
+    
     Args:
         data: JSON data to analyze
         max_depth: Maximum depth to analyze
-        current_depth: Current depth in recursion
+        current_depth: Depth of data within the document
         
     Returns:
         dict: Structure analysis
     """
-    if current_depth >= max_depth:
-        return {
-            'type': 'truncated',
-            'depth': current_depth,
-            'message': f'Structure truncated at depth {max_depth}'
-        }
+    root = {}
+    # Stack of pending values with their depth and the empty dict already
+    # linked into the parent's 'children' or 'sample_items'
+    work = [(data, current_depth, root)]
     
-    if isinstance(data, dict):
-        return {
-            'type': 'object',
-            'keys': list(data.keys()),
-            'key_count': len(data),
-            'has_nested': any(isinstance(v, (dict, list)) for v in data.values()),
-            'children': {
-                key: analyze_json_structure(value, max_depth, current_depth + 1)
-                for key, value in data.items()
-            } if current_depth < max_depth - 1 else None
-        }
-    elif isinstance(data, list):
-        return {
-            'type': 'array',
-            'length': len(data),
-            'has_nested': any(isinstance(item, (dict, list)) for item in data),
-            'sample_items': [
-                analyze_json_structure(item, max_depth, current_depth + 1)
-                for item in data[:5]  # Sample first 5 items
-            ] if data and current_depth < max_depth - 1 else None
-        }
-    else:
-        return {
-            'type': 'primitive',
-            'value_type': type(data).__name__,
-            'value_length': len(str(data)) if data is not None else 0,
-            'is_long': len(str(data)) > 100 if data is not None else False
-        }
+    while work:
+        value, depth, info = work.pop()
+        
+        if depth >= max_depth:
+            info.update({
+                'type': 'truncated',
+                'depth': depth,
+                'message': f'Structure truncated at depth {max_depth}'
+            })
+            continue
+        
+        expand = depth < max_depth - 1
+        # Match on the exact type; the same check drives 'has_nested' below
+        kind = type(value)
+        if kind is dict:
+            children = None
+            if expand:
+                children = {}
+                for key, item in value.items():
+                    slot = children[key] = {}
+                    work.append((item, depth + 1, slot))
+            info.update({
+                'type': 'object',
+                'keys': list(value.keys()),
+                'key_count': len(value),
+                'has_nested': any(type(v) in _CONTAINER_TYPES for v in value.values()),
+                'children': children
+            })
+        elif kind is list:
+            samples = None
+            if value and expand:
+                samples = []
+                for item in value[:5]:  # Sample first 5 items
+                    slot = {}
+                    samples.append(slot)
+                    work.append((item, depth + 1, slot))
+            info.update({
+                'type': 'array',
+                'length': len(value),
+                'has_nested': any(type(item) in _CONTAINER_TYPES for item in value),
+                'sample_items': samples
+            })
+        else:
+            # Strings are measured directly rather than copied through str()
+            if kind is str:
+                text_length = len(value)
+            else:
+                text_length = len(str(value)) if value is not None else 0
+            info.update({
+                'type': 'primitive',
+                'value_type': type(value).__name__,
+                'value_length': text_length,
+                'is_long': text_length > 100
+            })
+    
+    return root
 
 def count_elements(data):
     """
@@ -116,68 +167,87 @@ def count_elements(data):
     Returns:
         int: Total element count
     """
-    if isinstance(data, dict):
-        return 1 + sum(count_elements(v) for v in data.values())
-    elif isinstance(data, list):
-        return 1 + sum(count_elements(item) for item in data)
-    else:
-        return 1
+    # Order does not matter for a count, so a flat work list replaces recursion
+    total = 0
+    work = deque([data])
+    
+    while work:
+        item = work.pop()
+        total += 1
+        kind = type(item)
+        if kind is dict:
+            work.extend(item.values())
+        elif kind is list:
+            work.extend(item)
+    
+    return total
 
-def prepare_tree_data(data, path="", max_depth=10, current_depth=0):
+def prepare_tree_data(data, path="", max_depth=10, current_depth=0, name='root', with_ids=True):
     """
     Prepare JSON data for tree view generation
     
+    Walks the data with an explicit stack rather than recursion, so deeply
+    nested documents neither pay per-node frame overhead nor hit the
+    interpreter recursion limit.
+    
     Args:
         data: JSON data
         path: Current path in the tree
         max_depth: Maximum depth to process
         current_depth: Current depth
+        name: Display name of the node (object key or array index)
+        with_ids: Give every node its path string as 'id'; callers that
+            derive paths themselves can skip building one string per node
         
     Returns:
         dict: Tree node data
     """
-    if current_depth >= max_depth:
-        return {
-            'id': path or 'root',
-            'name': '...',
-            'type': 'truncated',
-            'expanded': False,
-            'children': []
-        }
+    root = {'children': []}
+    # Each entry is (value, path or None, depth, name, children list of the parent)
+    stack = [(data, path if with_ids else None, current_depth, name, root['children'])]
     
-    if isinstance(data, dict):
-        return {
-            'id': path or 'root',
-            'name': path.split('.')[-1] if '.' in path else 'root',
-            'type': 'object',
-            'expanded': current_depth < 2,  # Auto-expand first 2 levels
-            'children': [
-                prepare_tree_data(value, f"{path}.{key}" if path else key, 
-                                max_depth, current_depth + 1)
-                for key, value in data.items()
-            ]
-        }
-    elif isinstance(data, list):
-        return {
-            'id': path or 'root',
-            'name': path.split('.')[-1] if '.' in path else 'root',
-            'type': 'array',
-            'expanded': current_depth < 2,
-            'children': [
-                prepare_tree_data(item, f"{path}[{i}]" if path else f"[{i}]", 
-                                max_depth, current_depth + 1)
-                for i, item in enumerate(data)
-            ]
-        }
-    else:
-        return {
-            'id': path or 'root',
-            'name': path.split('.')[-1] if '.' in path else 'root',
-            'type': 'primitive',
-            'value': data,
-            'expanded': False,
-            'children': []
-        }
+    while stack:
+        value, node_path, depth, node_name, siblings = stack.pop()
+        node = {'id': node_path or 'root'} if with_ids else {}
+        node['name'] = node_name
+        siblings.append(node)
+        
+        if depth >= max_depth:
+            node['type'] = 'truncated'
+            node['expanded'] = False
+            node['children'] = []
+            continue
+        
+        kind = type(value)
+        if kind is dict:
+            children = []
+            node['type'] = 'object'
+            node['expanded'] = depth < 2  # Auto-expand first 2 levels
+            node['children'] = children
+            # Push in reverse so children are emitted in document order
+            for key, item in reversed(list(value.items())):
+                child_path = None
+                if with_ids:
+                    child_path = f"{node_path}.{key}" if node_path else key
+                stack.append((item, child_path, depth + 1, key, children))
+        elif kind is list:
+            children = []
+            node['type'] = 'array'
+            node['expanded'] = depth < 2
+            node['children'] = children
+            for i in range(len(value) - 1, -1, -1):
+                index = f"[{i}]"
+                child_path = None
+                if with_ids:
+                    child_path = f"{node_path}{index}" if node_path else index
+                stack.append((value[i], child_path, depth + 1, index, children))
+        else:
+            node['type'] = 'primitive'
+            node['value'] = value
+            node['expanded'] = False
+            node['children'] = []
+    
+    return root['children'][0]
 
 def get_node_by_path(data, path):
     """
@@ -197,8 +267,7 @@ def get_node_by_path(data, path):
     current_path = 'root'
     
     # Split path by dots and brackets
-    import re
-    parts = re.split(r'\.|\[|\]', path)
+    parts = _PATH_SPLIT_RE.split(path)
     parts = [p for p in parts if p]  # Remove empty strings
     
     for part in parts:
@@ -234,16 +303,31 @@ def format_value_for_display(value, max_length=200):
     Returns:
         str: Formatted value
     """
-    if value is None:
-        return '<span class="null">null</span>'
-    elif isinstance(value, bool):
-        return f'<span class="boolean">{str(value).lower()}</span>'
-    elif isinstance(value, (int, float)):
-        return f'<span class="number">{value}</span>'
-    elif isinstance(value, str):
-        if len(value) > max_length:
-            return f'<span class="string">"{value[:max_length]}..."</span>'
-        else:
-            return f'<span class="string">"{value}"</span>'
-    else:
-        return f'<span class="unknown">{str(value)}</span>' 
\ No newline at end of file
+    formatter = _VALUE_FORMATTERS.get(type(value))
+    if formatter is None:
+        return f'<span class="unknown">{escape_html(value)}</span>'
+    return formatter(value, max_length)
+
+def escape_html(value):
+    """Escape a value for safe interpolation into HTML text or attributes"""
+    return (value if isinstance(value, str) else str(value)).translate(_HTML_ESC)
+
+def _format_string(value, max_length):
+    """Format a string value, truncated to max_length characters"""
+    if len(value) > max_length:
+        return f'<span class="string">"{escape_html(value[:max_length])}..."</span>'
+    return f'<span class="string">"{escape_html(value)}"</span>'
+
+def _format_number(value, max_length):
+    """Format an int or float value; numbers are never truncated"""
+    return f'<span class="number">{value}</span>'
+
+# One lookup on the exact type replaces the isinstance chain, where bool had
+# to be ruled out before every int
+_VALUE_FORMATTERS = {
+    type(None): lambda value, max_length: '<span class="null">null</span>',
+    bool: lambda value, max_length: '<span class="boolean">true</span>' if value else '<span class="boolean">false</span>',
+    int: _format_number,
+    float: _format_number,
+    str: _format_string,
+}
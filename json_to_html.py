@@ -12,7 +12,7 @@ from loguru import logger
 # Import our modules
 from input_detector import get_input_info
 from json_parser import parse_json_file
-from html_generator import write_html_file, create_interactive_html
+from html_generator import write_interactive_html
 
 def setup_logging(output_dir):
     """Setup logging for the conversion process"""
@@ -21,12 +21,14 @@ def setup_logging(output_dir):
     
     # JSON log file
     json_log_path = output_dir / "conversion_log.json"
+    # File sinks are written from loguru's background thread (enqueue=True)
+    # so serializing and writing records never blocks the conversion
     logger.add(json_log_path, format="{time} | {level} | {message}", 
-               serialize=True, level="DEBUG")
+               serialize=True, level="DEBUG", enqueue=True)
     
     # Human-readable log
     md_log_path = output_dir / "conversion_summary.md"
-    logger.add(md_log_path, format="{message}", level="INFO")
+    logger.add(md_log_path, format="{message}", level="INFO", enqueue=True)
     
     # Console output
     logger.add(sys.stderr, format="{time} | {level} | {message}", level="INFO")
@@ -47,9 +49,9 @@ def convert_to_html(input_path, output_path=None, config=None):
         config = {}
     
     try:
-        # Detect and validate input
+        # Detect and validate input; parse_json_file analyzes the structure itself
         logger.info(f"Analyzing input: {input_path}")
-        input_info = get_input_info(input_path)
+        input_info = get_input_info(input_path, analyze=False)
         
         logger.info(f"Input type: {input_info['type']}")
         logger.info(f"Validation: {input_info['validation']}")
@@ -96,22 +98,21 @@ def convert_to_html(input_path, output_path=None, config=None):
             for warning in warnings:
                 logger.warning(f"   - {warning}")
         
-        # Parse JSON file
+        # Parse JSON file, reusing the data and element count from validation
         logger.info("Parsing JSON file...")
-        json_data = parse_json_file(input_path, config)
+        json_data = parse_json_file(input_path, config, data=input_info['data'],
+                                    total_elements=input_info.get('total_elements'))
         
         # Generate output path if not provided
         if output_path is None:
             input_name = Path(input_path).stem
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            # Reuse the run timestamp so the HTML lands next to the logs
+            timestamp = config.get('timestamp') or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
             output_path = f"output/{timestamp}/{input_name}.html"
         
-        # Create interactive HTML
+        # Create interactive HTML, streamed straight to the output file
         logger.info("Generating interactive HTML explorer...")
-        html_content = create_interactive_html(json_data, config)
-        
-        # Write HTML file
-        success = write_html_file(html_content, output_path, config)
+        success = write_interactive_html(json_data, output_path, config)
         
         if success:
             logger.info(f"✅ Conversion successful!")
@@ -127,15 +128,27 @@ def convert_to_html(input_path, output_path=None, config=None):
         logger.error(f"❌ Conversion failed: {str(e)}")
         return False
 
-def main():
-    """Main entry point"""
-    if len(sys.argv) < 2:
+def main(argv=None):
+    """
+    Main entry point
+    
+    Args:
+        argv (list, optional): Command-line arguments without the program
+            name; defaults to sys.argv[1:]
+        
+    Returns:
+        int: Process exit code
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    if len(argv) < 1:
         print("Usage: python json_to_html.py <input_json_file> [output_html_file]")
         print("Example: python json_to_html.py input/data.json")
-        sys.exit(1)
+        return 1
     
-    input_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    input_path = argv[0]
+    output_path = argv[1] if len(argv) > 1 else None
     
     # Create output directory with timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -153,7 +166,13 @@ def main():
         'theme': 'light',
         'auto_expand_levels': 2,
         'show_line_numbers': True,
-        'enable_syntax_highlighting': True
+        'enable_syntax_highlighting': True,
+        'inline_css': True,
+        'inline_js': True,
+        'compress_data': False,
+        'external_data': False,
+        'precompress': False,
+        'timestamp': timestamp
     }
     
     # Perform conversion
@@ -161,10 +180,10 @@ def main():
     
     if success:
         logger.info("🎉 Conversion completed successfully!")
-        sys.exit(0)
+        return 0
     else:
         logger.error("💥 Conversion failed!")
-        sys.exit(1)
+        return 1
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -21,12 +21,14 @@ def setup_logging(output_dir):
     
     # JSON log file
     json_log_path = output_dir / "conversion_log.json"
+    # File sinks are written from loguru's background thread (enqueue=True)
+    # so serializing and writing records never blocks the conversion
     logger.add(json_log_path, format="{time} | {level} | {message}", 
-               serialize=True, level="DEBUG")
+               serialize=True, level="DEBUG", enqueue=True)
     
     # Human-readable log
     md_log_path = output_dir / "conversion_summary.md"
-    logger.add(md_log_path, format="{message}", level="INFO")
+    logger.add(md_log_path, format="{message}", level="INFO", enqueue=True)
     
     # Console output
     logger.add(sys.stderr, format="{time} | {level} | {message}", level="INFO")
@@ -83,12 +85,14 @@ def convert_to_json(input_path, output_path=None, config=None):
                 # For XML files, use the file stem
                 input_name = Path(input_path).stem
             
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            # Reuse the run timestamp so the JSON lands next to the logs
+            timestamp = config.get('timestamp') or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
             output_path = f"output/{timestamp}/{input_name}.json"
         
         # Create LLM-optimized JSON
         logger.info("Generating LLM-optimized JSON...")
-        llm_json = create_llm_optimized_json(internal_data, config)
+        llm_json = create_llm_optimized_json(internal_data, config,
+                                             generated_at=config.get('generated_at'))
         
         # Write JSON file
         success = write_json_file(llm_json, output_path, config)
@@ -121,18 +125,24 @@ def main():
     
     args = parser.parse_args()
     
+    # One clock reading for the whole run names the log and output folders
+    # and is recorded as the generation time inside the JSON
+    started_at = datetime.now()
+    timestamp = started_at.strftime("%Y-%m-%d_%H-%M-%S")
+    
     # Setup configuration
     config = {
         'indent': args.indent,
         'sort_keys': args.sort_keys,
-        'ensure_ascii': args.ensure_ascii
+        'ensure_ascii': args.ensure_ascii,
+        'timestamp': timestamp,
+        'generated_at': started_at.isoformat()
     }
     
     # Create output directory for logging
     if args.output:
         output_dir = Path(args.output).parent
     else:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         output_dir = Path(f"output/{timestamp}")
     
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -4,15 +4,35 @@ Parser Module
 Handles parsing of both markdown files and XML files into a common internal format
 """
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from loguru import logger
 
+# Directories below a documentation folder that never hold its markdown
+_SKIPPED_DIRS = frozenset(('node_modules', '__pycache__'))
+
+# Folders holding at least this much markdown are parsed in worker processes;
+# below it, spawning workers and pickling the sections back costs more than
+# parsing everything in-process
+_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# Numeric ordering prefix of a folder name such as "01.Introduction"
+_FOLDER_ORDER_RE = re.compile(r'(\d+)\.(.+)')
+
+# Section numbering such as "1.2" or "1.2.3" ahead of a header title
+_SECTION_NUMBER_RE = re.compile(r'(\d+\.\d+(?:\.\d+)*)\s+(.+)')
+
 def parse_markdown_content(content, file_id):
     """
     Parse markdown content and convert to internal structure
     
+    Open sections are kept on a stack indexed by level; a header closes every
+    open section at its level or deeper into its parent, so no section is
+    dropped when a shallower header follows it.
+    
     Args:
         content (str): Markdown content
         file_id (str): File identifier
@@ -20,32 +40,28 @@ def parse_markdown_content(content, file_id):
     Returns:
         list: List of sections with hierarchical structure
     """
-    lines = content.split('\n')
     sections = []
-    current_section = None
-    current_subsection = None
-    current_subsubsection = None
+    stack = []  # stack[i] is the open section of level i + 1
     current_content = []
     
-    for line in lines:
+    for line in content.split('\n'):
         # Check for headers
-        if line.strip().startswith('#'):
+        if line.lstrip().startswith('#'):
             # Save previous content
             if current_content:
-                if current_subsubsection:
-                    current_subsubsection['content'] = '\n'.join(current_content)
-                elif current_subsection:
-                    current_subsection['content'] = '\n'.join(current_content)
-                elif current_section:
-                    current_section['content'] = '\n'.join(current_content)
+                if stack:
+                    stack[-1]['content'] = '\n'.join(current_content)
                 current_content = []
             
             # Parse header level and numbering
-            header_level = len(line) - len(line.lstrip('#'))
-            header_text = line.lstrip('#').strip()
+            header_text = line.lstrip('#')
+            header_level = len(line) - len(header_text)
+            if not 1 <= header_level <= 3:
+                continue  # Not a section header this parser keeps
+            header_text = header_text.strip()
             
             # Extract numbering and title
-            number_match = re.match(r'(\d+\.\d+(?:\.\d+)*)\s+(.+)', header_text)
+            number_match = _SECTION_NUMBER_RE.match(header_text)
             if number_match:
                 number = number_match.group(1)
                 title = number_match.group(2)
@@ -54,98 +70,61 @@ def parse_markdown_content(content, file_id):
                 number = None
                 title = header_text
             
-            if header_level == 1:  # Main section
-                if current_section:
-                    sections.append(current_section)
-                current_section = {
-                    'number': number,
-                    'title': title,
-                    'level': 1,
-                    'subsections': [],
-                    'content': ''
-                }
-                current_subsection = None
-                current_subsubsection = None
-                
-            elif header_level == 2:  # Subsection
-                # If we don't have a current section, create one
-                if not current_section:
-                    current_section = {
-                        'number': None,
-                        'title': 'Main Content',
-                        'level': 1,
-                        'subsections': [],
-                        'content': ''
-                    }
-                
-                if current_subsection:
-                    current_section['subsections'].append(current_subsection)
-                current_subsection = {
-                    'number': number,
-                    'title': title,
-                    'level': 2,
-                    'subsubsections': [],
-                    'content': ''
-                }
-                current_subsubsection = None
-                
-            elif header_level == 3:  # Sub-subsection
-                # If we don't have a current section, create one
-                if not current_section:
-                    current_section = {
-                        'number': None,
-                        'title': 'Main Content',
-                        'level': 1,
-                        'subsections': [],
-                        'content': ''
-                    }
-                
-                # If we don't have a current subsection, create one
-                if not current_subsection:
-                    current_subsection = {
-                        'number': None,
-                        'title': 'Subsection',
-                        'level': 2,
-                        'subsubsections': [],
-                        'content': ''
-                    }
-                
-                if current_subsubsection:
-                    current_subsection['subsubsections'].append(current_subsubsection)
-                current_subsubsection = {
-                    'number': number,
-                    'title': title,
-                    'level': 3,
-                    'content': ''
-                }
-                
+            # Close open sections at this level or deeper
+            while len(stack) >= header_level:
+                _close_section(stack, sections)
+            
+            # Create placeholder parents for a header that skips levels
+            while len(stack) < header_level - 1:
+                stack.append(_new_section(len(stack) + 1, None, _PLACEHOLDER_TITLES[len(stack)]))
+            
+            stack.append(_new_section(header_level, number, title))
+            
         else:
             # Regular content line
             current_content.append(line)
     
     # Save final content
-    if current_content:
-        if current_subsubsection:
-            current_subsubsection['content'] = '\n'.join(current_content)
-        elif current_subsection:
-            current_subsection['content'] = '\n'.join(current_content)
-        elif current_section:
-            current_section['content'] = '\n'.join(current_content)
+    if current_content and stack:
+        stack[-1]['content'] = '\n'.join(current_content)
     
     # Add final sections
-    if current_subsubsection and current_subsection:
-        current_subsection['subsubsections'].append(current_subsubsection)
-    if current_subsection and current_section:
-        current_section['subsections'].append(current_subsection)
-    if current_section:
-        sections.append(current_section)
+    while stack:
+        _close_section(stack, sections)
     
     return sections
 
+# Titles of the parents created for headers that skip a level
+_PLACEHOLDER_TITLES = ('Main Content', 'Subsection')
+
+# Key holding the child sections of each level that has them
+_CHILDREN_KEYS = {1: 'subsections', 2: 'subsubsections'}
+
+def _new_section(level, number, title):
+    """Create the section dict for a header of the given level (1-3)"""
+    section = {'number': number, 'title': title, 'level': level}
+    children_key = _CHILDREN_KEYS.get(level)
+    if children_key:
+        section[children_key] = []
+    section['content'] = ''
+    return section
+
+def _close_section(stack, sections):
+    """Pop the innermost open section and append it to its parent"""
+    section = stack.pop()
+    if stack:
+        stack[-1][_CHILDREN_KEYS[stack[-1]['level']]].append(section)
+    else:
+        sections.append(section)
+
 def parse_xml_file(file_path):
     """
     Parse XML file and convert to internal structure
     
+    The document is streamed with iterparse and each <file> element is
+    cleared once converted, so memory stays proportional to one file
+    rather than to the whole document.
+    
     Args:
         file_path (str or Path): Path to XML file
         
@@ -153,80 +132,31 @@ def parse_xml_file(file_path):
         dict: Internal data structure
     """
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
-        # Extract metadata
-        metadata = {
-            'name': root.get('name', 'Unknown'),
-            'version': root.get('version', '1.0'),
-            'processed_at': root.get('processed_at', ''),
-            'source_folder': root.get('source_folder', '')
-        }
-        
-        # Parse structure
+        metadata = None
         files = []
+        # Tags of the elements currently open, outermost first
+        open_tags = []
         
-        for folder_elem in root.findall('folder'):
-            for file_elem in folder_elem.findall('file'):
-                file_data = {
-                    'id': file_elem.get('id', ''),
-                    'name': file_elem.get('name', ''),
-                    'path': file_elem.get('path', ''),
-                    'sections': []
-                }
-                
-                # Parse sections
-                for section_elem in file_elem.findall('section'):
-                    section_data = {
-                        'id': section_elem.get('id', ''),
-                        'title': section_elem.get('title', ''),
-                        'level': 1,
-                        'content': '',
-                        'subsections': []
+        for event, elem in ET.iterparse(str(file_path), events=('start', 'end')):
+            if event == 'start':
+                if metadata is None:
+                    # Extract metadata from the root element's attributes
+                    metadata = {
+                        'name': elem.get('name', 'Unknown'),
+                        'version': elem.get('version', '1.0'),
+                        'processed_at': elem.get('processed_at', ''),
+                        'source_folder': elem.get('source_folder', '')
                     }
-                    
-                    # Get content
-                    content_elem = section_elem.find('content')
-                    if content_elem is not None and content_elem.text:
-                        section_data['content'] = content_elem.text.strip()
-                    
-                    # Parse subsections
-                    for subsection_elem in section_elem.findall('subsection'):
-                        subsection_data = {
-                            'id': subsection_elem.get('id', ''),
-                            'title': subsection_elem.get('title', ''),
-                            'level': 2,
-                            'content': '',
-                            'subsubsections': []
-                        }
-                        
-                        # Get content
-                        content_elem = subsection_elem.find('content')
-                        if content_elem is not None and content_elem.text:
-                            subsection_data['content'] = content_elem.text.strip()
-                        
-                        # Parse sub-subsections
-                        for subsubsection_elem in subsection_elem.findall('subsubsection'):
-                            subsubsection_data = {
-                                'id': subsubsection_elem.get('id', ''),
-                                'title': subsubsection_elem.get('title', ''),
-                                'level': 3,
-                                'content': ''
-                            }
-                            
-                            # Get content
-                            content_elem = subsubsection_elem.find('content')
-                            if content_elem is not None and content_elem.text:
-                                subsubsection_data['content'] = content_elem.text.strip()
-                            
-                            subsection_data['subsubsections'].append(subsubsection_data)
-                        
-                        section_data['subsections'].append(subsection_data)
-                    
-                    file_data['sections'].append(section_data)
-                
-                files.append(file_data)
+                open_tags.append(elem.tag)
+                continue
+            
+            open_tags.pop()
+            depth = len(open_tags)
+            # Files are read from root > folder > file, as before
+            if depth == 2 and elem.tag == 'file' and open_tags[1] == 'folder':
+                files.append(parse_xml_file_element(elem))
+            if 0 < depth <= 2:
+                elem.clear()
         
         return {
             'name': metadata['name'],
@@ -240,6 +170,69 @@ def parse_xml_file(file_path):
         logger.error(f"Failed to parse XML file {file_path}: {e}")
         raise
 
+def parse_xml_file_element(file_elem):
+    """
+    Convert one <file> element and its sections to internal structure
+    
+    Args:
+        file_elem (Element): Complete <file> element
+        
+    Returns:
+        dict: File data with nested sections
+    """
+    file_data = {
+        'id': file_elem.get('id', ''),
+        'name': file_elem.get('name', ''),
+        'path': file_elem.get('path', ''),
+        'sections': []
+    }
+    
+    # Parse sections
+    for section_elem in file_elem.findall('section'):
+        section_data = {
+            'id': section_elem.get('id', ''),
+            'title': section_elem.get('title', ''),
+            'level': 1,
+            'content': '',
+            'subsections': []
+        }
+        
+        # Get content
+        section_data['content'] = section_elem.findtext('content', '').strip()
+        
+        # Parse subsections
+        for subsection_elem in section_elem.findall('subsection'):
+            subsection_data = {
+                'id': subsection_elem.get('id', ''),
+                'title': subsection_elem.get('title', ''),
+                'level': 2,
+                'content': '',
+                'subsubsections': []
+            }
+            
+            # Get content
+            subsection_data['content'] = subsection_elem.findtext('content', '').strip()
+            
+            # Parse sub-subsections
+            for subsubsection_elem in subsection_elem.findall('subsubsection'):
+                subsubsection_data = {
+                    'id': subsubsection_elem.get('id', ''),
+                    'title': subsubsection_elem.get('title', ''),
+                    'level': 3,
+                    'content': ''
+                }
+                
+                # Get content
+                subsubsection_data['content'] = subsubsection_elem.findtext('content', '').strip()
+                
+                subsection_data['subsubsections'].append(subsubsection_data)
+            
+            section_data['subsections'].append(subsection_data)
+        
+        file_data['sections'].append(section_data)
+    
+    return file_data
+
 def detect_folder_structure(folder_path):
     """
     Detect folder structure and collect metadata
@@ -254,8 +247,11 @@ def detect_folder_structure(folder_path):
     folder = Path(folder_path)
     folders = []
     
-    # Get all subdirectories (excluding hidden folders)
-    subdirs = [d for d in folder.iterdir() if d.is_dir() and not d.name.startswith('.')]
+    # Get all subdirectories (excluding hidden folders); scandir entries
+    # usually know their type without another stat call
+    with os.scandir(folder) as entries:
+        subdirs = [folder / entry.name for entry in entries
+                   if not entry.name.startswith('.') and entry.is_dir()]
     subdirs.sort()  # Sort to maintain order
     
     for i, subdir in enumerate(subdirs, 1):
@@ -263,7 +259,7 @@ def detect_folder_structure(folder_path):
         folder_name = subdir.name
         
         # Try to extract numeric prefix for ordering
-        order_match = re.match(r'(\d+)\.(.+)', folder_name)
+        order_match = _FOLDER_ORDER_RE.match(folder_name)
         if order_match:
             folder_id = order_match.group(1)
             folder_name_clean = order_match.group(2)
@@ -286,6 +282,56 @@ def detect_folder_structure(folder_path):
     
     return folders
 
+def find_markdown_files(folder_path):
+    """
+    Find markdown files below a folder in a single directory walk
+    
+    os.walk works from the directory entries it already read, so unlike
+    Path.rglob it makes no extra stat call per entry to match the pattern.
+    Hidden directories and dependency/cache trees are pruned, so their
+    contents are never listed.
+    
+    Args:
+        folder_path (str or Path): Folder to search recursively
+        
+    Returns:
+        list: Sorted list of Path objects for the .md files found
+    """
+    md_files = []
+    for root, dirs, files in os.walk(folder_path):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in _SKIPPED_DIRS]
+        md_files.extend(Path(root, name) for name in files if name.endswith('.md'))
+    md_files.sort()
+    return md_files
+
+def _total_size(paths):
+    """Sum the sizes of files, counting unreadable ones as empty"""
+    total = 0
+    for path in paths:
+        try:
+            total += os.stat(path).st_size
+        except OSError:
+            pass  # Reported when the file itself fails to parse
+    return total
+
+def _parse_markdown_file(task):
+    """
+    Read and parse one markdown file; runs in a worker process for large folders
+    
+    Args:
+        task (tuple): (file path, 1-based index of the file in its folder)
+        
+    Returns:
+        tuple: (sections, None) on success, (None, error message) on failure
+    """
+    file_path, index = task
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return parse_markdown_content(content, f"file_{index}"), None
+    except Exception as e:
+        return None, str(e)
+
 def parse_markdown_folder(folder_path, config=None):
     """
     Parse markdown folder and convert to internal structure with folder hierarchy
@@ -306,37 +352,39 @@ def parse_markdown_folder(folder_path, config=None):
     # First, detect folder structure (subdirectories of input folder)
     folders = detect_folder_structure(folder_path)
     
-    # Process files within each folder
+    # Find markdown files in each folder (recursively)
+    jobs = []
     for folder_data in folders:
         folder_path_obj = folder / folder_data['path']
+        for i, file_path in enumerate(find_markdown_files(folder_path_obj), 1):
+            jobs.append((folder_data, folder_path_obj, i, file_path))
+    
+    # Files parse independently, so large folders are spread across processes;
+    # map() returns the results in job order
+    tasks = [(file_path, i) for _, _, i, file_path in jobs]
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1 and _total_size(path for path, _ in tasks) >= _PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            results = list(executor.map(_parse_markdown_file, tasks, chunksize=chunksize))
+    else:
+        results = [_parse_markdown_file(task) for task in tasks]
+    
+    for (folder_data, folder_path_obj, i, file_path), (sections, error) in zip(jobs, results):
+        if error is not None:
+            logger.error(f"Failed to parse markdown file {file_path}: {error}")
+            continue
         
-        # Find markdown files in this folder (recursively)
-        md_files = list(folder_path_obj.rglob("*.md"))
-        md_files.sort()
+        # Create file data - use relative path from the subfolder, not from input folder
+        file_data = {
+            'id': f"{folder_data['id']}.{i:02d}",
+            'name': file_path.name,
+            'path': str(file_path.relative_to(folder_path_obj)),  # Relative to the subfolder itself
+            'sections': sections
+        }
         
-        for i, file_path in enumerate(md_files, 1):
-            try:
-                # Read markdown content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Parse content
-                sections = parse_markdown_content(content, f"file_{i}")
-                
-                # Create file data - use relative path from the subfolder, not from input folder
-                file_data = {
-                    'id': f"{folder_data['id']}.{i:02d}",
-                    'name': file_path.name,
-                    'path': str(file_path.relative_to(folder_path_obj)),  # Relative to the subfolder itself
-                    'sections': sections
-                }
-                
-                folder_data['files'].append(file_data)
-                logger.debug(f"Parsed markdown file: {file_path.name} in folder {folder_data['name']}")
-                
-            except Exception as e:
-                logger.error(f"Failed to parse markdown file {file_path}: {e}")
-                continue
+        folder_data['files'].append(file_data)
+        logger.debug(f"Parsed markdown file: {file_path.name} in folder {folder_data['name']}")
     
     # Use the first subfolder name as the main name, or a generic name if multiple folders
     if len(folders) == 1:
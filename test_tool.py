@@ -6,15 +6,82 @@ Tests all major functionality including valid JSON, error handling, and edge cas
 
 import os
 import sys
+import base64
+import gzip
 import json
+import math
 import tempfile
 from pathlib import Path
+from unittest import mock
 from loguru import logger
 
 # Import our modules
-from input_detector import get_input_info, validate_json_file
+from input_detector import get_input_info, validate_json_file, validate_json_structure, load_json_file
+from input_detector import _MMAP_MIN_SIZE
 from json_parser import parse_json_file
-from html_generator import create_interactive_html, write_html_file
+from html_generator import create_interactive_html, write_html_file, write_interactive_html
+import parser
+from parser import parse_markdown_content, parse_xml_file, parse_markdown_folder
+import json_generator
+from json_generator import encode_json, create_json_document, write_json_file
+
+# ~1MB JSON document for the large file edge case, built once at import
+_LARGE_JSON_BYTES = b'{"test": "' + b'x' * 1000000 + b'"}'
+
+# Parsed-file payload for the HTML output test; create_interactive_html
+# only reads its input, so one shared copy serves every run
+_HTML_TEST_DATA = {
+    "data": {
+        "test_object": {
+            "string": "test value",
+            "number": 42,
+            "boolean": True,
+            "null": None,
+            "array": [1, 2, 3],
+            "nested": {
+                "deep": "value"
+            }
+        }
+    },
+    "metadata": {
+        "file_path": "test.json",
+        "file_name": "test.json",
+        "file_size": 100,
+        "root_type": "dict",
+        "total_elements": 10
+    }
+}
+
+# Documentation XML for the XML parsing test: files only count directly under
+# root > folder, and content text is stripped
+_XML_TEST_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<documentation name="Docs" version="2.1" processed_at="2025-07-21" source_folder="docs">
+    <folder id="01" name="Intro">
+        <file id="01.01" name="start.md" path="start.md">
+            <section id="1" title="Start">
+                <content>
+                    Welcome &amp; hello
+                </content>
+                <subsection id="1.1" title="Install">
+                    <content>pip install</content>
+                    <subsubsection id="1.1.1" title="Linux">
+                        <content> apt </content>
+                    </subsubsection>
+                    <subsubsection id="1.1.2" title="Empty"><content/></subsubsection>
+                </subsection>
+            </section>
+            <section id="2" title="No content"/>
+        </file>
+        <folder id="01.a" name="Nested">
+            <file id="skip" name="nested.md" path="nested.md"/>
+        </folder>
+    </folder>
+    <file id="skip" name="loose.md" path="loose.md"/>
+    <folder id="02" name="Usage">
+        <file id="02.01" name="use.md" path="use.md"/>
+    </folder>
+</documentation>
+"""
 
 def setup_test_logging():
     """Setup logging for tests"""
@@ -27,31 +94,19 @@ def test_valid_json():
     
     # Test with sample.json
     result = get_input_info("input/sample.json")
+    assert result['validation'] == 'valid', f"Valid JSON detection failed: {result.get('error')}"
+    print("✅ Valid JSON detection working")
     
-    if result['validation'] == 'valid':
-        print("✅ Valid JSON detection working")
-        
-        # Test parsing
-        try:
-            parsed_data = parse_json_file("input/sample.json")
-            print("✅ JSON parsing working")
-            
-            # Test HTML generation
-            html_content = create_interactive_html(parsed_data)
-            if html_content and len(html_content) > 1000:
-                print("✅ HTML generation working")
-            else:
-                print("❌ HTML generation failed")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Processing failed: {e}")
-            return False
-    else:
-        print(f"❌ Valid JSON detection failed: {result['error']}")
-        return False
+    # Test parsing, reusing the validated data as convert_to_html does
+    parsed_data = parse_json_file("input/sample.json", data=result['data'],
+                                  total_elements=result['total_elements'])
+    assert parsed_data is not None, "JSON parsing failed"
+    print("✅ JSON parsing working")
     
-    return True
+    # Test HTML generation
+    html_content = create_interactive_html(parsed_data)
+    assert html_content and len(html_content) > 1000, "HTML generation failed"
+    print("✅ HTML generation working")
 
 def test_error_handling():
     """Test error handling with various invalid inputs"""
@@ -63,7 +118,7 @@ def test_error_handling():
         ("input_detector.py", "INVALID_EXTENSION"),
     ]
     
-    all_passed = True
+    failures = []
     
     for file_path, expected_error in test_cases:
         print(f"  Testing {file_path}...")
@@ -73,139 +128,435 @@ def test_error_handling():
             print(f"  ✅ {expected_error} correctly detected")
         else:
             print(f"  ❌ Expected {expected_error}, got {result.get('error_code', 'UNKNOWN')}")
-            all_passed = False
+            failures.append(file_path)
     
-    return all_passed
+    assert not failures, f"Unexpected error codes for: {', '.join(failures)}"
 
 def test_edge_cases():
     """Test edge cases and boundary conditions"""
     print("\n🧪 Testing edge cases...")
     
-    # Test empty file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        f.write("")
-        empty_file = f.name
-    
-    try:
+    # Fixture files live in one temporary directory removed on exit
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Test empty file
+        empty_file = Path(temp_dir) / "empty.json"
+        empty_file.write_bytes(b"")
+        
         result = get_input_info(empty_file)
-        if result.get('error_code') == 'EMPTY_FILE':
-            print("✅ Empty file detection working")
+        assert result.get('error_code') == 'EMPTY_FILE', "Empty file detection failed"
+        print("✅ Empty file detection working")
+        
+        # Test large file simulation
+        large_file = Path(temp_dir) / "large.json"
+        large_file.write_bytes(_LARGE_JSON_BYTES)
+        
+        result = get_input_info(large_file)
+        assert result['validation'] == 'valid', "Large file handling failed"
+        print("✅ Large file handling working")
+        
+        # A symlink loop cannot be resolved, so it counts as a missing file
+        loop_file = Path(temp_dir) / "loop.json"
+        loop_file.symlink_to(loop_file)
+        
+        result = get_input_info(loop_file)
+        assert result.get('error_code') == 'FILE_NOT_FOUND', "Symlink loop not reported as missing"
+        print("✅ Symlink loop handling working")
+
+def test_json_loading():
+    """Test the fast loading path and its stdlib fallback for stricter inputs"""
+    print("\n🧪 Testing JSON loading...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Small inputs are read in one call
+        small_file = Path(temp_dir) / "small.json"
+        small_file.write_text('{"name": "caf\u00e9", "items": [1, 2.5, null, true]}', encoding="utf-8")
+        assert load_json_file(small_file) == {"name": "café", "items": [1, 2.5, None, True]}, \
+            "Small file loaded incorrectly"
+        print("✅ Small file loading working")
+        
+        # Inputs from the mmap threshold up are parsed from a memory mapping
+        for size in (_MMAP_MIN_SIZE - 1, _MMAP_MIN_SIZE, _MMAP_MIN_SIZE + 1):
+            sized_file = Path(temp_dir) / f"sized_{size}.json"
+            padding = "y" * (size - len('{"pad": "", "n": 1}'))
+            sized_file.write_text('{"pad": "%s", "n": 1}' % padding, encoding="utf-8")
+            assert sized_file.stat().st_size == size, "Test file has the wrong size"
+            assert load_json_file(sized_file) == {"pad": padding, "n": 1}, \
+                f"{size}-byte file loaded incorrectly"
+        
+        # The fallback also applies to mapped inputs
+        large_nan_file = Path(temp_dir) / "large_nan.json"
+        large_nan_file.write_text('{"pad": "%s", "nan": NaN}' % ("y" * _MMAP_MIN_SIZE), encoding="utf-8")
+        assert math.isnan(load_json_file(large_nan_file)["nan"]), "Stdlib fallback failed for mapped input"
+        print("✅ Memory-mapped loading working")
+        
+        # orjson rejects NaN and integers wider than 64 bits; the stdlib accepts them
+        lenient_file = Path(temp_dir) / "lenient.json"
+        lenient_file.write_text('{"nan": NaN, "big": 123456789012345678901234567890}', encoding="utf-8")
+        data = load_json_file(lenient_file)
+        assert math.isnan(data["nan"]) and data["big"] == 123456789012345678901234567890, \
+            "Stdlib fallback failed"
+        
+        invalid_file = Path(temp_dir) / "invalid.json"
+        invalid_file.write_text('{"a": }', encoding="utf-8")
+        try:
+            load_json_file(invalid_file)
+        except json.JSONDecodeError:
+            pass
         else:
-            print("❌ Empty file detection failed")
-            return False
-    finally:
-        os.unlink(empty_file)
+            raise AssertionError("Invalid JSON was accepted")
+        print("✅ Stdlib fallback working")
+
+def test_structure_validation():
+    """Test key checks in the structure validator"""
+    print("\n🧪 Testing structure validation...")
     
-    # Test large file simulation
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        f.write('{"test": "' + 'x' * 1000000 + '"}')  # ~1MB file
-        large_file = f.name
+    # A None key is a real key, not the marker used for the root and list items
+    result = validate_json_structure({None: 1})
+    assert not result['is_valid'] and 'NoneType' in result['error'], "None key not rejected"
     
-    try:
-        result = get_input_info(large_file)
-        if result['validation'] == 'valid':
-            print("✅ Large file handling working")
-        else:
-            print("❌ Large file handling failed")
-            return False
-    finally:
-        os.unlink(large_file)
+    result = validate_json_structure([None, {"key": [None]}])
+    assert result['is_valid'] and result['total_elements'] == 5, "Valid nulls rejected"
+    print("✅ Structure validation working")
+
+def test_markdown_nesting():
+    """Test section nesting for h1/h2/h3 sequences and unkept header levels"""
+    print("\n🧪 Testing markdown section nesting...")
+    
+    # A sub-subsection followed by a subsection, and a subsection followed
+    # by a main section, used to drop the section that was still open
+    sections = parse_markdown_content(
+        "# Guide\n"
+        "## 1.1 Install\n"
+        "### 1.1.1 Linux\n"
+        "apt install\n"
+        "## 1.2 Usage\n"
+        "run it\n"
+        "# Reference\n",
+        "file_1"
+    )
+    assert [s['title'] for s in sections] == ['Guide', 'Reference'], "Main sections wrong"
+    install, usage = sections[0]['subsections']
+    assert (install['number'], install['title']) == ('1.1', 'Install'), "Subsection wrong"
+    assert [s['title'] for s in install['subsubsections']] == ['Linux'], "Sub-subsection dropped"
+    assert install['subsubsections'][0]['content'] == 'apt install', "Sub-subsection content wrong"
+    assert usage['title'] == 'Usage' and usage['content'] == 'run it', "Last subsection dropped"
+    assert sections[1]['subsections'] == [], "Subsections leaked into the next section"
+    
+    # Content before the first header belongs to no section; skipped levels
+    # get placeholder parents and h4 headers are not sections
+    sections = parse_markdown_content(
+        "preamble\n"
+        "## Setup\n"
+        "### Deep\n"
+        "#### Deeper\n",
+        "file_2"
+    )
+    assert len(sections) == 1 and sections[0]['title'] == 'Main Content', "Placeholder section missing"
+    assert sections[0]['content'] == '', "Preamble attached to a section"
+    setup = sections[0]['subsections'][0]
+    assert setup['title'] == 'Setup', "Subsection under placeholder wrong"
+    assert [s['title'] for s in setup['subsubsections']] == ['Deep'], "h4 header treated as a section"
     
-    return True
+    sections = parse_markdown_content("### Only\ntext", "file_3")
+    subsection = sections[0]['subsections'][0]
+    assert (sections[0]['title'], subsection['title']) == ('Main Content', 'Subsection'), "Placeholders wrong"
+    assert subsection['subsubsections'][0]['content'] == 'text', "Skipped-level content wrong"
+    print("✅ Markdown section nesting working")
+
+def test_parallel_markdown_folder():
+    """Test that worker-process parsing matches in-process parsing"""
+    print("\n🧪 Testing parallel markdown parsing...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for folder in ("01.Intro", "02.Usage"):
+            folder_path = Path(temp_dir) / folder
+            (folder_path / "deep").mkdir(parents=True)
+            for i in range(3):
+                (folder_path / f"{i}.md").write_text(
+                    f"# {folder} {i}\n\n## 1.1 Part\n\ntext {i}\n", encoding="utf-8")
+            (folder_path / "deep" / "nested.md").write_text("### Nested\nbody", encoding="utf-8")
+        # Not UTF-8, so it fails to parse and is reported instead
+        (Path(temp_dir) / "01.Intro" / "1b.md").write_bytes(b"# Bad \xff\xfe\n")
+        
+        def parse(min_bytes):
+            errors = []
+            sink = logger.add(lambda message: errors.append(message.record['message']), level="ERROR")
+            try:
+                with mock.patch.object(parser, '_PARALLEL_MIN_BYTES', min_bytes):
+                    return parse_markdown_folder(temp_dir), errors
+            finally:
+                logger.remove(sink)
+        
+        serial, serial_errors = parse(float('inf'))
+        # Force the process pool even for tiny folders and single-core hosts
+        with mock.patch.object(parser.os, 'cpu_count', return_value=2):
+            parallel, parallel_errors = parse(0)
+    
+    assert [f['name'] for f in serial['folders'][0]['files']] == \
+        ['0.md', '1.md', '2.md', 'nested.md'], "Unexpected serial file order"
+    assert len(serial_errors) == 1 and "1b.md" in serial_errors[0], "Bad file not reported"
+    assert parallel == serial, "Parallel parsing differs from serial parsing"
+    assert parallel_errors == serial_errors, "Parallel parsing reports different errors"
+    print("✅ Parallel markdown parsing working")
+
+def test_xml_parsing():
+    """Test that streamed XML parsing keeps the structure of a full tree walk"""
+    print("\n🧪 Testing XML parsing...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_file = Path(temp_dir) / "docs.xml"
+        xml_file.write_text(_XML_TEST_DOCUMENT, encoding="utf-8")
+        result = parse_xml_file(xml_file)
+    
+    # What the earlier ET.parse walk over root > folder > file produced
+    expected = {
+        'name': 'Docs',
+        'version': '2.1',
+        'source_type': 'xml',
+        'source_path': str(xml_file),
+        'files': [
+            {
+                'id': '01.01', 'name': 'start.md', 'path': 'start.md',
+                'sections': [
+                    {
+                        'id': '1', 'title': 'Start', 'level': 1,
+                        'content': 'Welcome & hello',
+                        'subsections': [
+                            {
+                                'id': '1.1', 'title': 'Install', 'level': 2,
+                                'content': 'pip install',
+                                'subsubsections': [
+                                    {'id': '1.1.1', 'title': 'Linux', 'level': 3, 'content': 'apt'},
+                                    {'id': '1.1.2', 'title': 'Empty', 'level': 3, 'content': ''},
+                                ]
+                            }
+                        ]
+                    },
+                    {'id': '2', 'title': 'No content', 'level': 1, 'content': '', 'subsections': []},
+                ]
+            },
+            {'id': '02.01', 'name': 'use.md', 'path': 'use.md', 'sections': []},
+        ]
+    }
+    assert result == expected, f"Streamed XML structure differs: {result}"
+    print("✅ XML parsing working")
+
+def test_json_encoding():
+    """Test JSON output layouts on the orjson and stdlib paths"""
+    print("\n🧪 Testing JSON encoding...")
+    
+    data = {"b": [1, 2.5, None, True], "a": {"name": "caf\u00e9", "empty": []}}
+    layouts = [
+        ({}, dict(indent=2)),
+        ({'indent': None}, dict(separators=(',', ':'))),
+        ({'indent': 4}, dict(indent=4)),
+        ({'sort_keys': True}, dict(indent=2, sort_keys=True)),
+        ({'indent': None, 'sort_keys': True}, dict(separators=(',', ':'), sort_keys=True)),
+        ({'ensure_ascii': True}, dict(indent=2, ensure_ascii=True)),
+    ]
+    
+    # Run every layout with orjson (when installed) and with the stdlib only
+    for fast in (json_generator.orjson, None):
+        with mock.patch.object(json_generator, 'orjson', fast):
+            for config, dumps_options in layouts:
+                dumps_options.setdefault('ensure_ascii', False)
+                expected = json.dumps(data, **dumps_options).encode('utf-8')
+                assert encode_json(data, config) == expected, f"Layout {config} differs"
+            
+            # NaN and infinities keep the stdlib spelling rather than null
+            special = {"nan": float('nan'), "values": [float('inf'), -float('inf')]}
+            assert encode_json(special, {'indent': None}) == \
+                b'{"nan":NaN,"values":[Infinity,-Infinity]}', "Non-finite floats not preserved"
+    print("✅ JSON layouts working")
+    
+    # The encoded document from create_json_document can be written as is
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = Path(temp_dir) / "doc.json"
+        document = create_json_document({'name': 'Docs', 'files': []})
+        assert write_json_file(document, output_path), "Encoded document not written"
+        assert output_path.read_bytes() == document, "Written document differs"
+        
+        assert write_json_file(document.decode('utf-8'), output_path), "Text document not written"
+        assert output_path.read_bytes() == document, "Written text document differs"
+    print("✅ JSON document writing working")
+
+def test_failed_json_write():
+    """Test that a failed encode leaves no partial JSON file behind"""
+    print("\n🧪 Testing failed JSON writes...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = Path(temp_dir) / "out.json"
+        # Sets are not JSON; indent=4 takes the streaming stdlib path
+        assert not write_json_file({"a": {1, 2}}, output_path, {'indent': 4}), "Bad data written"
+        assert not any(Path(temp_dir).iterdir()), "Partial output left behind"
+        
+        output_path.write_text("previous", encoding="utf-8")
+        assert not write_json_file({"a": {1, 2}}, output_path, {'indent': 4}), "Bad data written"
+        assert output_path.read_text(encoding="utf-8") == "previous", "Previous output clobbered"
+        assert [p.name for p in Path(temp_dir).iterdir()] == ["out.json"], "Temporary file left behind"
+    print("✅ Failed JSON writes leave no partial output")
 
 def test_html_output():
     """Test HTML output generation and file writing"""
     print("\n🧪 Testing HTML output...")
     
-    # Create test data
-    test_data = {
-        "data": {
-            "test_object": {
-                "string": "test value",
-                "number": 42,
-                "boolean": True,
-                "null": None,
-                "array": [1, 2, 3],
-                "nested": {
-                    "deep": "value"
-                }
-            }
-        },
-        "metadata": {
-            "file_path": "test.json",
-            "file_name": "test.json",
-            "file_size": 100,
-            "root_type": "dict",
-            "total_elements": 10
-        }
-    }
+    # Generate HTML
+    html_content = create_interactive_html(_HTML_TEST_DATA)
     
-    try:
-        # Generate HTML
-        html_content = create_interactive_html(test_data)
+    # Write to temporary file
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_html = Path(temp_dir) / "test.html"
+        success = write_html_file(html_content, temp_html)
+        assert success and temp_html.exists(), "HTML file writing failed"
         
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False) as f:
-            temp_html = f.name
+        # HTML should be substantial
+        assert temp_html.stat().st_size > 1000, "Generated HTML file too small"
+        print("✅ HTML file generation and writing working")
+
+def test_script_escaping():
+    """Test that string values cannot break out of the inline data script"""
+    print("\n🧪 Testing inline script escaping...")
+    
+    payload = "<!--<script></script>"
+    html_content = create_interactive_html({
+        "data": {"comment": payload},
+        "metadata": dict(_HTML_TEST_DATA["metadata"], root_type="dict")
+    })
+    
+    # Only the page's own tags may appear; the payload's markup must not
+    assert "<!--" not in html_content, "HTML comment opener leaked into the page"
+    assert html_content.count("</script>") == 1, "Payload closed the script element"
+    
+    # The escaped literal must still decode to the original value
+    start = html_content.index("let jsonData = ") + len("let jsonData = ")
+    end = html_content.index(";\n        const jsonDataReady", start)
+    embedded = json.loads(html_content[start:end])
+    assert payload in embedded["strings"], "Escaped payload does not round-trip"
+    print("✅ Inline script escaping working")
+
+def test_failed_html_write():
+    """Test that a failed generation leaves no partial HTML file behind"""
+    print("\n🧪 Testing failed HTML writes...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        html_path = Path(temp_dir) / "broken.html"
+        html_path.write_text("previous", encoding="utf-8")
+        # Missing metadata fails after the page head has been streamed
+        broken = {"data": _HTML_TEST_DATA["data"], "metadata": {"file_name": "x"}}
+        assert not write_interactive_html(broken, html_path), "Broken input reported as written"
+        assert html_path.read_text(encoding="utf-8") == "previous", "Previous output clobbered"
+        assert [p.name for p in Path(temp_dir).iterdir()] == ["broken.html"], "Temporary file left behind"
+    print("✅ Failed HTML writes leave no partial output")
+
+def test_linked_assets():
+    """Test linking the shared stylesheet and script instead of inlining them"""
+    print("\n🧪 Testing linked assets...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir)
         
-        success = write_html_file(html_content, temp_html)
+        # Defaults inline everything and write no assets
+        assert write_interactive_html(_HTML_TEST_DATA, output_dir / "inline.html"), "HTML writing failed"
+        html_content = (output_dir / "inline.html").read_text(encoding="utf-8")
+        assert "<style>" in html_content and "class TreeLayout" in html_content, "Assets not inlined"
+        assert not (output_dir / "explorer.css").exists(), "Stylesheet written when inlined"
+        assert not (output_dir / "explorer.js").exists(), "Script written when inlined"
         
-        if success and os.path.exists(temp_html):
-            file_size = os.path.getsize(temp_html)
-            if file_size > 1000:  # HTML should be substantial
-                print("✅ HTML file generation and writing working")
-                os.unlink(temp_html)
-                return True
-            else:
-                print("❌ Generated HTML file too small")
-                os.unlink(temp_html)
-                return False
-        else:
-            print("❌ HTML file writing failed")
-            return False
-            
-    except Exception as e:
-        print(f"❌ HTML output test failed: {e}")
-        return False
+        config = {'inline_css': False, 'inline_js': False}
+        assert write_interactive_html(_HTML_TEST_DATA, output_dir / "linked.html", config), \
+            "HTML writing failed"
+        html_content = (output_dir / "linked.html").read_text(encoding="utf-8")
+        assert '<link rel="stylesheet" href="explorer.css">' in html_content, "Stylesheet not linked"
+        assert '<script src="explorer.js"></script>' in html_content, "Script not linked"
+        assert "<style>" not in html_content and "class TreeLayout" not in html_content, \
+            "Linked assets also inlined"
+        assert "let jsonData = " in html_content, "Tree data no longer inline"
+        
+        css = (output_dir / "explorer.css").read_text(encoding="utf-8")
+        script = (output_dir / "explorer.js").read_text(encoding="utf-8")
+        assert css and "class TreeLayout" in script, "Asset files incomplete"
+    print("✅ Linked assets working")
+
+def test_data_modes():
+    """Test the sidecar-file and compressed ways of shipping the tree data"""
+    print("\n🧪 Testing tree data modes...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # External data: the page fetches a sidecar instead of embedding it
+        html_path = Path(temp_dir) / "external.html"
+        config = {'external_data': True, 'compress_data': True}
+        assert write_interactive_html(_HTML_TEST_DATA, html_path, config), "HTML writing failed"
+        
+        data_path = Path(temp_dir) / "external.data.json"
+        assert data_path.exists(), "No data sidecar written"
+        html_content = html_path.read_text(encoding="utf-8")
+        assert 'fetch("external.data.json")' in html_content, "Page does not fetch the sidecar"
+        assert "let jsonData = null;" in html_content and "atob(" not in html_content, \
+            "Data embedded despite external_data"
+        sidecar = json.loads(data_path.read_text(encoding="utf-8"))
+        assert "test value" in sidecar["strings"], "Sidecar is missing the tree data"
+        
+        # Characters with a meaning in URLs are percent-encoded in the fetch
+        html_path = Path(temp_dir) / "report #1?v=100%.html"
+        assert write_interactive_html(_HTML_TEST_DATA, html_path, {'external_data': True}), \
+            "HTML writing failed"
+        assert (Path(temp_dir) / "report #1?v=100%.data.json").exists(), "No data sidecar written"
+        assert 'fetch("report%20%231%3Fv%3D100%25.data.json")' in html_path.read_text(encoding="utf-8"), \
+            "Sidecar URL not escaped"
+        
+        # Compressed data: gzip + base64 inline, and no sidecar
+        html_path = Path(temp_dir) / "compressed.html"
+        assert write_interactive_html(_HTML_TEST_DATA, html_path, {'compress_data': True}), \
+            "HTML writing failed"
+        assert not (Path(temp_dir) / "compressed.data.json").exists(), "Unexpected data sidecar"
+        html_content = html_path.read_text(encoding="utf-8")
+        start = html_content.index("atob('") + len("atob('")
+        payload = html_content[start:html_content.index("')", start)]
+        embedded = json.loads(gzip.decompress(base64.b64decode(payload)))
+        assert embedded == sidecar, "Compressed payload differs from the plain tree data"
+    print("✅ Tree data modes working")
+
+def test_precompressed_output():
+    """Test that precompression covers the page and its data sidecar"""
+    print("\n🧪 Testing precompressed output...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        html_path = Path(temp_dir) / "test.html"
+        config = {'external_data': True, 'precompress': True}
+        assert write_interactive_html(_HTML_TEST_DATA, html_path, config), "HTML writing failed"
+        
+        for name in ("test.html", "test.data.json"):
+            original = Path(temp_dir) / name
+            compressed = Path(temp_dir) / (name + ".gz")
+            assert compressed.exists(), f"No precompressed copy of {name}"
+            assert gzip.decompress(compressed.read_bytes()) == original.read_bytes(), \
+                f"Precompressed {name} does not match the original"
+    print("✅ Precompressed output working")
 
 def test_complete_workflow():
     """Test the complete workflow from input to output"""
     print("\n🧪 Testing complete workflow...")
     
+    # Run the main entry point in-process rather than in a new interpreter
+    import json_to_html
     try:
-        # Run the main script
-        import subprocess
-        result = subprocess.run([
-            sys.executable, "json_to_html.py", "input/sample.json"
-        ], capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            print("✅ Complete workflow successful")
-            
-            # Check if output was created
-            output_dirs = [d for d in Path("output").iterdir() if d.is_dir() and d.name != ".DS_Store"]
-            if output_dirs:
-                latest_output = max(output_dirs, key=lambda x: x.stat().st_mtime)
-                html_files = list(latest_output.glob("*.html"))
-                if html_files:
-                    print(f"✅ Output HTML file created: {html_files[0]}")
-                    return True
-                else:
-                    print("❌ No HTML output file found")
-                    return False
-            else:
-                print("❌ No output directory created")
-                return False
-        else:
-            print(f"❌ Workflow failed: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print("❌ Workflow timed out")
-        return False
-    except Exception as e:
-        print(f"❌ Workflow test failed: {e}")
-        return False
+        exit_code = json_to_html.main(["input/sample.json"])
+    finally:
+        setup_test_logging()  # main() replaces the logging sinks with its own
+    
+    assert exit_code == 0, f"Workflow failed with exit code {exit_code}"
+    print("✅ Complete workflow successful")
+    
+    # Check if output was created; scandir entries cache their type
+    # and stat results
+    with os.scandir("output") as entries:
+        output_dirs = [e for e in entries if e.is_dir() and e.name != ".DS_Store"]
+    assert output_dirs, "No output directory created"
+    
+    latest_output = max(output_dirs, key=lambda e: e.stat().st_mtime)
+    html_files = list(Path(latest_output.path).glob("*.html"))
+    assert html_files, "No HTML output file found"
+    print(f"✅ Output HTML file created: {html_files[0]}")
 
 def main():
     """Run all tests"""
@@ -217,7 +568,19 @@ def main():
         ("Valid JSON Processing", test_valid_json),
         ("Error Handling", test_error_handling),
         ("Edge Cases", test_edge_cases),
+        ("JSON Loading", test_json_loading),
+        ("Structure Validation", test_structure_validation),
+        ("Markdown Nesting", test_markdown_nesting),
+        ("Parallel Markdown Folder", test_parallel_markdown_folder),
+        ("XML Parsing", test_xml_parsing),
+        ("JSON Encoding", test_json_encoding),
+        ("Failed JSON Write", test_failed_json_write),
         ("HTML Output", test_html_output),
+        ("Script Escaping", test_script_escaping),
+        ("Failed HTML Write", test_failed_html_write),
+        ("Linked Assets", test_linked_assets),
+        ("Data Modes", test_data_modes),
+        ("Precompressed Output", test_precompressed_output),
         ("Complete Workflow", test_complete_workflow),
     ]
     
@@ -230,11 +593,11 @@ def main():
         print('='*50)
         
         try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name} PASSED")
-            else:
-                print(f"❌ {test_name} FAILED")
+            test_func()
+            passed += 1
+            print(f"✅ {test_name} PASSED")
+        except AssertionError as e:
+            print(f"❌ {test_name} FAILED: {e}")
         except Exception as e:
             print(f"❌ {test_name} FAILED with exception: {e}")
     